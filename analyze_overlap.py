@@ -1,44 +1,84 @@
 #!/usr/bin/env python3
 """Analyze provider overlap across signals"""
+import argparse
 import json
-from collections import Counter
+import sys
+from pathlib import Path
 
-with open("fraud_signals.json", "r") as f:
-    data = json.load(f)
+import duckdb
+import numpy as np
+
+parser = argparse.ArgumentParser(description=__doc__)
+parser.add_argument(
+    "signal_table", nargs="?", default="fraud_signals.parquet",
+    help="Parquet signal table written by 'python -m src.main --signal-table PATH' "
+         "(default: fraud_signals.parquet)",
+)
+SIGNALS_PATH = parser.parse_args().signal_table
+if not Path(SIGNALS_PATH).is_file():
+    sys.exit(f"Signal table not found: {SIGNALS_PATH}\n"
+             f"Write one with: python -m src.main --signal-table {SIGNALS_PATH}")
+
+conn = duckdb.connect()
+
+header = conn.execute(
+    "SELECT value FROM parquet_kv_metadata(?) WHERE key = 'report'", [SIGNALS_PATH]
+).fetchone()
+header = json.loads(header[0]) if header else {}
+total_scanned = header.get("total_providers_scanned")
+total_flagged = header.get("total_providers_flagged")
+report_signal_counts = header.get("signal_counts")
+
+# One row per flagged provider; provider_rank is its position in the report
+conn.execute("""
+    CREATE TEMP TABLE provider_signals AS
+    SELECT
+        npi,
+        COUNT(*) AS num_signals,
+        LIST(signal_type ORDER BY signal_index) AS signal_types,
+        MIN(provider_rank) AS pos
+    FROM read_parquet(?)
+    GROUP BY npi
+""", [SIGNALS_PATH])
 
 print("=== Output Structure ===")
-print(f"Total scanned: {data.get('total_providers_scanned', 'N/A')}")
-print(f"Total flagged: {data.get('total_providers_flagged', 'N/A')}")
+print(f"Total scanned: {total_scanned if total_scanned is not None else 'N/A'}")
+print(f"Total flagged: {total_flagged if total_flagged is not None else 'N/A'}")
 print()
 print("Signal counts:")
-for sig, count in data.get("signal_counts", {}).items():
+for sig, count in (report_signal_counts or {}).items():
     print(f"  {sig}: {count:,}")
 
-# Analyze overlap
-provider_signals = {}
-for provider in data.get("flagged_providers", []):
-    npi = provider["npi"]
-    signals = provider["signals"]
-    provider_signals[npi] = signals
-
 # Count by number of signals
-signal_counts = Counter(len(signals) for signals in provider_signals.values())
+num_signals = conn.execute(
+    "SELECT num_signals FROM provider_signals"
+).fetchnumpy()["num_signals"]
+signal_counts = np.bincount(num_signals.astype(np.int32))
+total_providers = len(num_signals)
 
 print()
 print("=== Provider Overlap Analysis ===")
-print(f"Total unique providers: {len(provider_signals):,}")
+print(f"Total unique providers: {total_providers:,}")
 print()
 print("Providers by # of signals:")
-for num_signals in sorted(signal_counts.keys(), reverse=True):
-    count = signal_counts[num_signals]
-    pct = count / len(provider_signals) * 100
-    print(f"  {num_signals} signal(s): {count:,} providers ({pct:.1f}%)")
+for n in range(len(signal_counts) - 1, 0, -1):
+    count = int(signal_counts[n])
+    if count:
+        pct = count / total_providers * 100
+        print(f"  {n} signal(s): {count:,} providers ({pct:.1f}%)")
 
 # High risk
+high_risk_count = int(signal_counts[3:].sum())
+high_risk = conn.execute("""
+    SELECT npi, signal_types
+    FROM provider_signals
+    WHERE num_signals >= 3
+    ORDER BY num_signals DESC, pos
+    LIMIT 10
+""").fetchall()
+
 print()
 print("=== Highest Risk (3+ signals) ===")
-high_risk = [(npi, sigs) for npi, sigs in provider_signals.items() if len(sigs) >= 3]
-print(f"Count: {len(high_risk)}")
-for npi, sigs in sorted(high_risk, key=lambda x: -len(x[1]))[:10]:
-    sig_ids = [s["signal_id"] for s in sigs]
-    print(f"  NPI {npi}: {sig_ids}")
+print(f"Count: {high_risk_count}")
+for npi, signal_types in high_risk:
+    print(f"  NPI {npi}: {signal_types}")
@@ -1,17 +1,40 @@
 #!/usr/bin/env python3
-import json
+import argparse
+import sys
+from pathlib import Path
 
-with open("fraud_signals.json") as f:
-    data = json.load(f)
+import duckdb
 
-invalid = 0
-invalid_examples = []
-for p in data["flagged_providers"]:
-    npi = p.get("npi", "")
-    if not npi or len(npi) != 10 or npi == "0000000000" or not npi.isdigit():
-        invalid += 1
-        if len(invalid_examples) < 5:
-            invalid_examples.append(npi)
-        
-print(f"Invalid NPIs: {invalid} / {len(data['flagged_providers'])}")
-print(f"Examples: {invalid_examples}")
+parser = argparse.ArgumentParser(description="Check flagged NPIs in a signal table")
+parser.add_argument(
+    "signal_table", nargs="?", default="fraud_signals.parquet",
+    help="Parquet signal table written by 'python -m src.main --signal-table PATH' "
+         "(default: fraud_signals.parquet)",
+)
+SIGNALS_PATH = parser.parse_args().signal_table
+if not Path(SIGNALS_PATH).is_file():
+    sys.exit(f"Signal table not found: {SIGNALS_PATH}\n"
+             f"Write one with: python -m src.main --signal-table {SIGNALS_PATH}")
+
+# Same rule as is_valid_npi: exactly 10 digits and not all zeros
+invalid, total, invalid_examples = duckdb.execute("""
+    WITH npis AS (
+        SELECT npi, MIN(provider_rank) AS pos
+        FROM read_parquet(?)
+        GROUP BY npi
+    )
+    SELECT
+        COUNT(*) FILTER (WHERE NOT valid),
+        COUNT(*),
+        (LIST(npi ORDER BY pos) FILTER (WHERE NOT valid))[1:5]
+    FROM (
+        SELECT
+            npi,
+            pos,
+            COALESCE(regexp_full_match(npi, '[0-9]{10}') AND npi <> '0000000000', false) AS valid
+        FROM npis
+    )
+""", [SIGNALS_PATH]).fetchone()
+
+print(f"Invalid NPIs: {invalid} / {total}")
+print(f"Examples: {invalid_examples or []}")
@@ -8,7 +8,10 @@
 #   --output FILE     Output JSON file (default: fraud_signals.json)
 #   --data-dir DIR    Data directory (default: ./data)
 #   --no-gpu          Disable GPU acceleration
-#   --memory-limit    DuckDB memory limit (default: 8GB)
+#   --memory-limit    DuckDB memory limit (default: 2GB)
+#   --low-memory      Run DuckDB single-threaded
+#   --signal-table P  Also write a Parquet signal table to P
+#   --top-k K         Only list the K highest-overpayment providers
 #   --verbose         Enable verbose output
 
 set -e
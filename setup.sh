@@ -8,7 +8,7 @@
 # 3. Downloads required data files
 #
 # Tested on: Ubuntu 22.04+, macOS 14+ (Apple Silicon)
-# Requires: Python 3.11+, curl, unzip
+# Requires: Python 3.11+, curl
 
 set -e
 
@@ -98,23 +98,16 @@ else
 fi
 
 # File 3: NPPES NPI Registry (~1GB zipped)
-if ls data/npidata_pfile_*.csv 1> /dev/null 2>&1; then
-    echo "  [3/3] NPPES NPI registry: already extracted ✓"
+# The CSV is streamed out of the zip on the first run, so it is not extracted here
+if ls data/npidata_pfile_*.csv 1> /dev/null 2>&1 || [ -f "data/nppes.parquet" ]; then
+    echo "  [3/3] NPPES NPI registry: already available ✓"
 elif [ -f "data/nppes.zip" ]; then
-    echo "  [3/3] Extracting NPPES NPI registry..."
-    cd data
-    unzip -o -q nppes.zip "npidata_pfile_*.csv"
-    cd ..
-    echo "       Extracted ✓"
+    echo "  [3/3] NPPES NPI registry: already downloaded ✓"
 else
     echo "  [3/3] Downloading NPPES NPI registry (~1GB)..."
     curl -L -# -o data/nppes.zip \
         "https://download.cms.gov/nppes/NPPES_Data_Dissemination_February_2026_V2.zip"
-    echo "       Extracting..."
-    cd data
-    unzip -o -q nppes.zip "npidata_pfile_*.csv"
-    cd ..
-    echo "       Downloaded and extracted ✓"
+    echo "       Downloaded ✓"
 fi
 
 echo ""
@@ -8,19 +8,104 @@ Loads and joins:
 """
 
 import duckdb
+import os
+import shutil
+import tempfile
+import threading
+import zipfile
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Optional
+from typing import Iterable, Iterator, Optional
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Per-billing-NPI rollups of spending. DataIngestor materializes them in the
+# database file; signal detection and the report create them on demand when
+# handed a connection that lacks them. Rows are stored sorted by NPI so each
+# row group covers a narrow NPI range and join filters can skip the rest.
+PROVIDER_TOTALS_SQL = """
+    SELECT 
+        BILLING_PROVIDER_NPI_NUM AS npi,
+        SUM(TOTAL_PAID) AS total_paid,
+        SUM(TOTAL_CLAIMS) AS total_claims,
+        SUM(TOTAL_UNIQUE_BENEFICIARIES) AS total_beneficiaries
+    FROM spending
+    GROUP BY BILLING_PROVIDER_NPI_NUM
+    ORDER BY npi
+"""
+
+PROVIDER_MONTHLY_SQL = """
+    SELECT 
+        BILLING_PROVIDER_NPI_NUM AS npi,
+        CLAIM_FROM_MONTH,
+        SUM(TOTAL_PAID) AS total_paid,
+        SUM(TOTAL_CLAIMS) AS total_claims
+    FROM spending
+    GROUP BY BILLING_PROVIDER_NPI_NUM, CLAIM_FROM_MONTH
+    ORDER BY npi, CLAIM_FROM_MONTH
+"""
+
+
+def _sql_literal(path: Path) -> str:
+    """Quote a path as a SQL string literal.
+    
+    Only for statements DuckDB cannot prepare (e.g. CREATE VIEW); everything
+    else binds paths as parameters.
+    """
+    return "'" + str(path).replace("'", "''") + "'"
+
 
 class DataIngestor:
     """Handles loading and joining of all data sources."""
     
-    def __init__(self, data_dir: Path, memory_limit: str = '2GB', temp_dir: str = None):
+    # Full LEIE UPDATED.csv schema, in file order
+    LEIE_COLUMNS = {
+        'LASTNAME': 'VARCHAR',
+        'FIRSTNAME': 'VARCHAR',
+        'MIDNAME': 'VARCHAR',
+        'BUSNAME': 'VARCHAR',
+        'GENERAL': 'VARCHAR',
+        'SPECIALTY': 'VARCHAR',
+        'UPIN': 'VARCHAR',
+        'NPI': 'VARCHAR',
+        'DOB': 'VARCHAR',
+        'ADDRESS': 'VARCHAR',
+        'CITY': 'VARCHAR',
+        'STATE': 'VARCHAR',
+        'ZIP': 'VARCHAR',
+        'EXCLTYPE': 'VARCHAR',
+        'EXCLDATE': 'VARCHAR',
+        'REINDATE': 'VARCHAR',
+        'WAIVERDATE': 'VARCHAR',
+        'WVRSTATE': 'VARCHAR',
+    }
+    
+    # NPPES columns derived once when the parquet cache is built, computed
+    # from the short column aliases in _nppes_select_sql
+    NPPES_DERIVED = {
+        'provider_name': "COALESCE(org_name, last_name || ', ' || first_name)",
+        'entity_type': "CASE WHEN entity_type_code = '1' THEN 'individual' ELSE 'organization' END",
+        # Normalized authorized-official name Signal 5 groups on; NULL unless
+        # both names are present
+        'official_key': (
+            "CASE WHEN TRIM(CAST(auth_official_last AS VARCHAR)) != '' "
+            "AND TRIM(CAST(auth_official_first AS VARCHAR)) != '' "
+            "THEN UPPER(TRIM(CAST(auth_official_last AS VARCHAR))) || '|' || "
+            "UPPER(TRIM(CAST(auth_official_first AS VARCHAR))) END"
+        ),
+    }
+    
+    def __init__(self, data_dir: Path, memory_limit: str = '2GB', temp_dir: str = None,
+                 low_memory: bool = False, db_path: Optional[str] = None):
         self.data_dir = Path(data_dir)
-        self.conn = duckdb.connect()
+        self.memory_limit = memory_limit
+        
+        # Persistent database so views and materialized intermediates survive
+        # across runs (pass db_path=':memory:' for a throwaway database)
+        if db_path is None:
+            db_path = str(self.data_dir / 'cache.duckdb')
+        self.conn = duckdb.connect(db_path)
         
         # Determine temp directory
         if temp_dir is None:
@@ -30,17 +115,52 @@ class DataIngestor:
         # Configure DuckDB for aggressive disk spillover
         # Key insight: DuckDB can handle large datasets with limited RAM
         # by spilling to disk, but we need enough disk space
-        self.conn.execute(f"SET memory_limit='{memory_limit}'")
-        self.conn.execute("SET threads=2")  # 2 threads for parallelism
-        self.conn.execute(f"SET temp_directory='{temp_dir}'")
+        self.conn.execute("SET memory_limit=?", [memory_limit])
+        # 2 threads for parallelism; low-memory mode drops to one, since each
+        # thread keeps its own hash-table and sort buffers under memory_limit
+        self.conn.execute("SET threads=?", [1 if low_memory else 2])
+        self.conn.execute("SET temp_directory=?", [temp_dir])
         self.conn.execute("SET max_temp_directory_size='20GB'")  # Allow more temp space
         self.conn.execute("SET preserve_insertion_order=false")
         self.conn.execute("SET checkpoint_threshold='128MB'")  # More frequent checkpoints
-        # Try to enable external algorithms (DuckDB 0.9+ only)
-        try:
-            self.conn.execute("SET force_external=true")
-        except Exception:
-            pass  # Older DuckDB versions don't support this
+        # Reuse parquet footers/row-group stats across the many signal queries
+        self.conn.execute("SET enable_object_cache=true")
+        self.conn.execute("SET enable_progress_bar=false")
+        
+        # Source file each cached object was built from, and its mtime then
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS ingest_meta (
+                name VARCHAR PRIMARY KEY,
+                source_path VARCHAR,
+                source_mtime DOUBLE
+            )
+        """)
+        
+    def is_current(self, name: str, source_path: Path) -> bool:
+        """True if table/view `name` exists and was built from source_path as it is now."""
+        exists = self.conn.execute(
+            "SELECT COUNT(*) FROM information_schema.tables WHERE table_schema = 'main' AND table_name = ?",
+            [name]
+        ).fetchone()[0]
+        if not exists:
+            return False
+        row = self.conn.execute(
+            "SELECT source_path, source_mtime FROM ingest_meta WHERE name = ?", [name]
+        ).fetchone()
+        return row is not None and row[0] == str(source_path) and row[1] == source_path.stat().st_mtime
+        
+    def mark_current(self, name: str, source_path: Path) -> None:
+        """Record that `name` was just built from source_path."""
+        self.conn.execute(
+            "INSERT OR REPLACE INTO ingest_meta VALUES (?, ?, ?)",
+            [name, str(source_path), source_path.stat().st_mtime]
+        )
+        
+    def _parquet_row_count(self, parquet_path: Path) -> int:
+        """Row count from the parquet footer, without scanning any data."""
+        return self.conn.execute(
+            "SELECT SUM(num_rows) FROM parquet_file_metadata(?)", [str(parquet_path)]
+        ).fetchone()[0]
         
     def load_spending_data(self) -> None:
         """Load HHS Medicaid Provider Spending parquet."""
@@ -52,34 +172,72 @@ class DataIngestor:
         logger.info(f"Loading spending data from {parquet_path}")
         
         # Create view (doesn't load all into memory)
-        self.conn.execute(f"""
-            CREATE OR REPLACE VIEW spending AS 
-            SELECT 
-                BILLING_PROVIDER_NPI_NUM,
-                SERVICING_PROVIDER_NPI_NUM,
-                HCPCS_CODE,
-                CLAIM_FROM_MONTH,
-                TOTAL_UNIQUE_BENEFICIARIES,
-                TOTAL_CLAIMS,
-                TOTAL_PAID
-            FROM read_parquet('{parquet_path}')
-        """)
+        if not self.is_current('spending', parquet_path):
+            self.conn.execute(f"""
+                CREATE OR REPLACE VIEW spending AS 
+                SELECT 
+                    BILLING_PROVIDER_NPI_NUM,
+                    SERVICING_PROVIDER_NPI_NUM,
+                    HCPCS_CODE,
+                    CLAIM_FROM_MONTH,
+                    TOTAL_UNIQUE_BENEFICIARIES,
+                    TOTAL_CLAIMS,
+                    TOTAL_PAID
+                FROM read_parquet({_sql_literal(parquet_path)})
+            """)
+            self.mark_current('spending', parquet_path)
         
-        # Get row count
-        count = self.conn.execute("SELECT COUNT(*) FROM spending").fetchone()[0]
+        count = self._parquet_row_count(parquet_path)
         logger.info(f"Spending data loaded: {count:,} rows")
         
+    @staticmethod
+    def _is_cached(source_path: Path, parquet_path: Path) -> bool:
+        """True if parquet_path exists and is at least as new as source_path."""
+        return parquet_path.exists() and parquet_path.stat().st_mtime >= source_path.stat().st_mtime
+        
+    def _parquet_columns(self, parquet_path: Path) -> set:
+        """Column names stored in a parquet file."""
+        return {row[0] for row in self.conn.execute(
+            "SELECT name FROM parquet_schema(?)", [str(parquet_path)]
+        ).fetchall()}
+        
+    def _cache_as_parquet(self, select_sql: str, source_path: Path, parquet_path: Path,
+                          read_path: Optional[Path] = None,
+                          required_columns: Iterable[str] = ()) -> None:
+        """Write select_sql to parquet_path unless an up-to-date copy exists.
+        
+        select_sql reads its input from the $source parameter, bound to
+        read_path (default: source_path). The parquet copy is rebuilt whenever
+        source_path is newer, or when it lacks any of required_columns (a
+        cache written before those columns existed). It is written to a temp
+        file first so an interrupted run never leaves a truncated cache behind.
+        """
+        if self._is_cached(source_path, parquet_path) and \
+                set(required_columns) <= self._parquet_columns(parquet_path):
+            return
+        
+        logger.info(f"Converting {source_path.name} to parquet (one-time)...")
+        tmp_path = parquet_path.with_name(parquet_path.name + '.tmp')
+        self.conn.execute(f"""
+            COPY ({select_sql}) TO $target
+            (FORMAT PARQUET, CODEC 'zstd', ROW_GROUP_SIZE 122880)
+        """, {'source': str(read_path or source_path), 'target': str(tmp_path)})
+        tmp_path.replace(parquet_path)
+        
     def load_leie_data(self) -> None:
         """Load OIG LEIE Exclusion List."""
         leie_path = self.data_dir / "UPDATED.csv"
+        leie_parquet = self.data_dir / "leie.parquet"
         
         if not leie_path.exists():
             raise FileNotFoundError(f"LEIE data not found: {leie_path}")
         
         logger.info(f"Loading LEIE data from {leie_path}")
         
-        self.conn.execute(f"""
-            CREATE OR REPLACE TABLE leie AS
+        # Typed schema skips CSV sniffing. Dates stay VARCHAR in the reader
+        # ('00000000' means empty) and go through TRY_STRPTIME, so a malformed
+        # date becomes NULL instead of ignore_errors dropping the whole record
+        self._cache_as_parquet(f"""
             SELECT 
                 LASTNAME,
                 FIRSTNAME,
@@ -90,60 +248,80 @@ class DataIngestor:
                 NPI,
                 STATE,
                 EXCLTYPE,
-                -- Parse dates from YYYYMMDD format (cast to VARCHAR, filter invalid)
-                CASE 
-                    WHEN EXCLDATE IS NOT NULL 
-                         AND LENGTH(CAST(EXCLDATE AS VARCHAR)) = 8 
-                         AND CAST(EXCLDATE AS VARCHAR) != '00000000'
-                    THEN strptime(CAST(EXCLDATE AS VARCHAR), '%Y%m%d')::DATE
-                    ELSE NULL
-                END AS EXCLDATE,
-                CASE 
-                    WHEN REINDATE IS NOT NULL 
-                         AND LENGTH(CAST(REINDATE AS VARCHAR)) = 8 
-                         AND CAST(REINDATE AS VARCHAR) != '00000000'
-                    THEN strptime(CAST(REINDATE AS VARCHAR), '%Y%m%d')::DATE
-                    ELSE NULL
-                END AS REINDATE
-            FROM read_csv_auto('{leie_path}', header=true, ignore_errors=true)
-        """)
+                TRY_STRPTIME(EXCLDATE, '%Y%m%d')::DATE AS EXCLDATE,
+                TRY_STRPTIME(REINDATE, '%Y%m%d')::DATE AS REINDATE
+            FROM read_csv(
+                $source,
+                columns={self.LEIE_COLUMNS},
+                header=true,
+                parallel=true,
+                nullstr=['', '00000000'],
+                ignore_errors=true
+            )
+        """, leie_path, leie_parquet)
         
-        count = self.conn.execute("SELECT COUNT(*) FROM leie").fetchone()[0]
-        npi_count = self.conn.execute(
-            "SELECT COUNT(*) FROM leie WHERE NPI IS NOT NULL AND NPI != ''"
-        ).fetchone()[0]
-        logger.info(f"LEIE data loaded: {count:,} rows ({npi_count:,} with NPI)")
+        if not self.is_current('leie', leie_parquet):
+            self.conn.execute(f"""
+                CREATE OR REPLACE VIEW leie AS
+                SELECT * FROM read_parquet({_sql_literal(leie_parquet)})
+            """)
+            self.mark_current('leie', leie_parquet)
         
-    def load_nppes_data(self) -> None:
-        """Load NPPES NPI Registry (required columns only)."""
-        # Check for unzipped CSV
-        nppes_csv = None
-        for f in self.data_dir.glob("npidata_pfile_*.csv"):
-            nppes_csv = f
-            break
-        
-        if nppes_csv is None:
-            # Try to find and extract from zip
-            nppes_zip = self.data_dir / "nppes.zip"
-            if nppes_zip.exists():
-                logger.info("Extracting NPPES zip...")
-                import zipfile
-                with zipfile.ZipFile(nppes_zip, 'r') as z:
-                    for name in z.namelist():
-                        if name.startswith("npidata_pfile") and name.endswith(".csv"):
-                            z.extract(name, self.data_dir)
-                            nppes_csv = self.data_dir / name
-                            break
-        
-        if nppes_csv is None or not nppes_csv.exists():
-            raise FileNotFoundError("NPPES data not found. Run setup.sh first.")
+        count = self._parquet_row_count(leie_parquet)
+        logger.info(f"LEIE data loaded: {count:,} rows")
+        if logger.isEnabledFor(logging.DEBUG):
+            # Needs a scan, so only computed for verbose runs
+            npi_count = self.conn.execute(
+                "SELECT COUNT(*) FROM leie WHERE NPI IS NOT NULL AND NPI != ''"
+            ).fetchone()[0]
+            logger.debug(f"LEIE rows with NPI: {npi_count:,}")
         
-        logger.info(f"Loading NPPES data from {nppes_csv}")
+    @contextmanager
+    def _stream_zip_member(self, zip_path: Path, member: str) -> Iterator[Path]:
+        """Yield a path DuckDB can read that streams a zip member.
         
-        # Load only required columns (10 out of 329)
-        # Note: Read full CSV then select needed columns (DuckDB optimizes this)
-        self.conn.execute(f"""
-            CREATE OR REPLACE TABLE nppes AS
+        The member is decompressed into a named pipe by a background thread,
+        so the multi-GB NPPES CSV never has to be written to disk. Platforms
+        without os.mkfifo fall back to extracting the member.
+        """
+        if not hasattr(os, 'mkfifo'):
+            with zipfile.ZipFile(zip_path, 'r') as z:
+                z.extract(member, self.data_dir)
+            yield self.data_dir / member
+            return
+        
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            fifo = Path(tmp_dir) / Path(member).name
+            os.mkfifo(fifo)
+            
+            def feed() -> None:
+                try:
+                    with zipfile.ZipFile(zip_path, 'r') as z, \
+                            z.open(member) as src, open(fifo, 'wb') as dst:
+                        shutil.copyfileobj(src, dst, 1 << 20)
+                except BrokenPipeError:
+                    pass  # Reader stopped early; the error surfaces on the DuckDB side
+            
+            writer = threading.Thread(target=feed, daemon=True)
+            writer.start()
+            try:
+                yield fifo
+            finally:
+                if writer.is_alive():
+                    # Release a writer still blocked waiting for a reader
+                    os.close(os.open(fifo, os.O_RDONLY | os.O_NONBLOCK))
+                writer.join(timeout=5)
+        
+    def _nppes_select_sql(self) -> str:
+        """Projection of the NPPES CSV down to the columns used downstream."""
+        # Load only required columns (11 out of 329). Every column is read as
+        # VARCHAR, so NPIs, ZIPs and taxonomy codes keep their leading zeros
+        # and no sniffed type can reject a row; projection pushdown means the
+        # remaining columns are never converted.
+        derived = ",\n                ".join(
+            f"{expr} AS {name}" for name, expr in self.NPPES_DERIVED.items()
+        )
+        return f"""
             SELECT 
                 "NPI" AS npi,
                 "Entity Type Code" AS entity_type_code,
@@ -155,26 +333,119 @@ class DataIngestor:
                 "Healthcare Provider Taxonomy Code_1" AS taxonomy_code,
                 "Provider Enumeration Date" AS enumeration_date,
                 "Authorized Official Last Name" AS auth_official_last,
-                "Authorized Official First Name" AS auth_official_first
-            FROM read_csv_auto(
-                '{nppes_csv}', 
-                header=true, 
-                ignore_errors=true,
-                all_varchar=true
+                "Authorized Official First Name" AS auth_official_first,
+                {derived}
+            FROM read_csv(
+                $source,
+                header=true,
+                all_varchar=true,
+                parallel=true
             )
             WHERE "NPI" IS NOT NULL
-        """)
+        """
+        
+    def load_nppes_data(self) -> None:
+        """Load NPPES NPI Registry (required columns only)."""
+        nppes_parquet = self.data_dir / "nppes.parquet"
+        nppes_zip = self.data_dir / "nppes.zip"
+        
+        # Check for unzipped CSV
+        nppes_csv = next(self.data_dir.glob("npidata_pfile_*.csv"), None)
+        
+        if nppes_csv is not None:
+            logger.info(f"Loading NPPES data from {nppes_csv}")
+            self._cache_as_parquet(self._nppes_select_sql(), nppes_csv, nppes_parquet,
+                                   required_columns=self.NPPES_DERIVED)
+        elif nppes_zip.exists() and not (
+            self._is_cached(nppes_zip, nppes_parquet)
+            and set(self.NPPES_DERIVED) <= self._parquet_columns(nppes_parquet)
+        ):
+            with zipfile.ZipFile(nppes_zip, 'r') as z:
+                member = next(
+                    (name for name in z.namelist()
+                     if name.startswith("npidata_pfile") and name.endswith(".csv")),
+                    None
+                )
+            if member is None:
+                raise FileNotFoundError(f"No npidata_pfile CSV found in {nppes_zip}")
+            
+            logger.info(f"Loading NPPES data from {nppes_zip}:{member} (streamed)")
+            with self._stream_zip_member(nppes_zip, member) as stream:
+                self._cache_as_parquet(
+                    self._nppes_select_sql(), nppes_zip, nppes_parquet, read_path=stream,
+                    required_columns=self.NPPES_DERIVED
+                )
+        elif nppes_parquet.exists():
+            logger.info(f"Loading NPPES data from cached {nppes_parquet}")
+        else:
+            raise FileNotFoundError("NPPES data not found. Run setup.sh first.")
+        
+        # A cache left by an older version may predate the derived columns;
+        # compute any that are missing in the view instead
+        missing = [name for name in self.NPPES_DERIVED
+                   if name not in self._parquet_columns(nppes_parquet)]
+        if missing or not self.is_current('nppes', nppes_parquet):
+            derived = "".join(f", {self.NPPES_DERIVED[name]} AS {name}" for name in missing)
+            self.conn.execute(f"""
+                CREATE OR REPLACE VIEW nppes AS
+                SELECT *{derived} FROM read_parquet({_sql_literal(nppes_parquet)})
+            """)
+            self.mark_current('nppes', nppes_parquet)
         
-        count = self.conn.execute("SELECT COUNT(*) FROM nppes").fetchone()[0]
+        count = self._parquet_row_count(nppes_parquet)
         logger.info(f"NPPES data loaded: {count:,} rows")
         
+    def build_provider_totals(self) -> None:
+        """Materialize all-time totals per billing NPI for report lookups.
+        
+        Stored in the database file and rebuilt only when the spending
+        parquet changes.
+        """
+        parquet_path = self.data_dir / "medicaid-provider-spending.parquet"
+        if self.is_current('provider_totals', parquet_path):
+            return
+        
+        logger.info("Aggregating per-provider spending totals")
+        self.conn.execute(f"CREATE OR REPLACE TABLE provider_totals AS {PROVIDER_TOTALS_SQL}")
+        self.conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_provider_totals_npi ON provider_totals(npi)"
+        )
+        self.mark_current('provider_totals', parquet_path)
+        
+    def build_provider_monthly(self) -> None:
+        """Materialize per-billing-NPI, per-month totals for signal detection.
+        
+        Signals that work month by month read this rollup instead of
+        re-aggregating the full spending scan. Rebuilt only when the spending
+        parquet changes.
+        """
+        parquet_path = self.data_dir / "medicaid-provider-spending.parquet"
+        if self.is_current('provider_monthly', parquet_path):
+            return
+        
+        logger.info("Aggregating per-provider monthly spending")
+        self.conn.execute(f"CREATE OR REPLACE TABLE provider_monthly AS {PROVIDER_MONTHLY_SQL}")
+        self.mark_current('provider_monthly', parquet_path)
+        
     def load_all(self) -> None:
         """Load all data sources."""
         self.load_spending_data()
         self.load_leie_data()
         self.load_nppes_data()
+        self.build_provider_totals()
+        self.build_provider_monthly()
         logger.info("All data sources loaded successfully")
         
+    def release_memory(self) -> None:
+        """Checkpoint the database between pipeline phases.
+        
+        Writes the rollups built during loading and detection from the WAL
+        into the database file, so the buffer manager can evict their pages
+        under the configured memory_limit instead of keeping them dirty. No
+        setting is changed, so other cursors on the connection are unaffected.
+        """
+        self.conn.execute("CHECKPOINT")
+        
     def get_connection(self) -> duckdb.DuckDBPyConnection:
         """Return the DuckDB connection for signal processing."""
         return self.conn
@@ -6,6 +6,7 @@ CLI tool that analyzes HHS Medicaid spending data to detect fraud signals.
 """
 
 import argparse
+import gc
 import logging
 import sys
 import os
@@ -18,18 +19,18 @@ from .ingest import DataIngestor
 from .signals import SignalDetector
 from .output import ReportGenerator
 
+_PAGE_SIZE = resource.getpagesize()
+
 
 def get_memory_usage_mb() -> float:
     """Get current memory usage in MB."""
     if platform.system() == 'Linux':
-        # More accurate on Linux
-        with open('/proc/self/status', 'r') as f:
-            for line in f:
-                if line.startswith('VmRSS:'):
-                    return int(line.split()[1]) / 1024  # KB to MB
-    # Fallback using resource module
-    usage = resource.getrusage(resource.RUSAGE_SELF)
-    return usage.ru_maxrss / 1024  # KB to MB on Linux
+        # statm is a single line; the second field is resident pages
+        with open('/proc/self/statm', 'rb') as f:
+            resident_pages = int(f.read().split()[1])
+        return resident_pages * _PAGE_SIZE / (1024 * 1024)
+    # Fallback: peak RSS is the closest portable figure
+    return get_peak_memory_mb()
 
 
 def get_peak_memory_mb() -> float:
@@ -40,6 +41,15 @@ def get_peak_memory_mb() -> float:
         return usage.ru_maxrss / (1024 * 1024)
     return usage.ru_maxrss / 1024
 
+
+def positive_int(value: str) -> int:
+    """argparse type for counts that must be at least 1."""
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {number}")
+    return number
+
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -58,6 +68,14 @@ Examples:
   python -m src.main --output fraud_signals.json
   python -m src.main --data-dir ./data --output results.json
   python -m src.main --no-gpu --output fraud_signals.json
+  python -m src.main --signal-table fraud_signals.parquet
+  python -m src.main --db-path :memory:
+
+By default the DuckDB cache lives in DATA_DIR/cache.duckdb. DuckDB locks that
+file exclusively, so a second run against the same data directory fails while
+the first is still running; use --db-path to point concurrent runs at separate
+files or at :memory:. If a crashed run leaves the cache in a bad state, delete
+cache.duckdb and it is rebuilt from the data files.
         """
     )
     
@@ -75,6 +93,15 @@ Examples:
         help='Output JSON file path (default: fraud_signals.json)'
     )
     
+    parser.add_argument(
+        '--signal-table',
+        type=str,
+        default=None,
+        metavar='PATH',
+        help='Also write one row per flagged signal to this Parquet file '
+             '(input for analyze_overlap.py and check_invalid.py)'
+    )
+    
     parser.add_argument(
         '--no-gpu',
         action='store_true',
@@ -84,8 +111,31 @@ Examples:
     parser.add_argument(
         '--memory-limit',
         type=str,
-        default='8GB',
-        help='DuckDB memory limit (default: 8GB)'
+        default='2GB',
+        help='DuckDB memory limit (default: 2GB)'
+    )
+    
+    parser.add_argument(
+        '--low-memory',
+        action='store_true',
+        help='Run DuckDB single-threaded to shrink its working set'
+    )
+    
+    parser.add_argument(
+        '--db-path',
+        type=str,
+        default=None,
+        metavar='PATH',
+        help='DuckDB database file, locked exclusively while running; '
+             ':memory: keeps nothing between runs (default: DATA_DIR/cache.duckdb)'
+    )
+    
+    parser.add_argument(
+        '--top-k',
+        type=positive_int,
+        default=None,
+        metavar='K',
+        help='Only list the K flagged providers with the highest estimated overpayment'
     )
     
     parser.add_argument(
@@ -95,6 +145,10 @@ Examples:
     )
     
     args = parser.parse_args()
+    if args.signal_table is not None and (
+        Path(args.signal_table).resolve() == Path(args.output).resolve()
+    ):
+        parser.error("--signal-table must be a different file from --output")
     
     if args.verbose:
         logging.getLogger().setLevel(logging.DEBUG)
@@ -110,8 +164,11 @@ Examples:
     logger.info("=" * 60)
     logger.info(f"Data directory: {data_dir.absolute()}")
     logger.info(f"Output file: {args.output}")
+    logger.info(f"Signal table: {args.signal_table or 'not written'}")
     logger.info(f"GPU disabled: {args.no_gpu}")
     logger.info(f"Memory limit: {args.memory_limit}")
+    logger.info(f"Low-memory mode: {args.low_memory}")
+    logger.info(f"Database: {args.db_path or data_dir / 'cache.duckdb'}")
     logger.info("")
     
     start_time = datetime.now()
@@ -119,7 +176,12 @@ Examples:
     try:
         # Phase 1: Data Ingestion
         logger.info("PHASE 1: Loading data sources...")
-        ingestor = DataIngestor(data_dir)
+        ingestor = DataIngestor(
+            data_dir,
+            memory_limit=args.memory_limit,
+            low_memory=args.low_memory,
+            db_path=args.db_path,
+        )
         ingestor.load_all()
         conn = ingestor.get_connection()
         
@@ -129,38 +191,45 @@ Examples:
         detector = SignalDetector(conn)
         signals = detector.detect_all_signals()
         
+        # Detection is done; hand DuckDB's buffer pages and any Python
+        # garbage back before the report is built
+        ingestor.release_memory()
+        gc.collect()
+        
         # Phase 3: Report Generation
         logger.info("")
         logger.info("PHASE 3: Generating report...")
         generator = ReportGenerator(conn)
-        report = generator.generate_report(signals, args.output)
-        
-        # Collect resource metrics
-        elapsed = datetime.now() - start_time
-        peak_memory_mb = get_peak_memory_mb()
-        current_memory_mb = get_memory_usage_mb()
+        # Provider records are assembled while the report streams to disk
+        report = generator.prepare_report(signals, top_k=args.top_k)
         
-        # Add resource metrics to report
-        report['execution_metrics'] = {
-            'total_runtime_seconds': round(elapsed.total_seconds(), 2),
-            'total_runtime_human': str(elapsed),
-            'peak_memory_mb': round(peak_memory_mb, 2),
-            'final_memory_mb': round(current_memory_mb, 2),
-            'platform': platform.system(),
-            'python_version': platform.python_version(),
-            'cpu_count': os.cpu_count(),
-        }
+        def execution_metrics() -> dict:
+            elapsed = datetime.now() - start_time
+            return {
+                'total_runtime_seconds': round(elapsed.total_seconds(), 2),
+                'total_runtime_human': str(elapsed),
+                'peak_memory_mb': round(get_peak_memory_mb(), 2),
+                'final_memory_mb': round(get_memory_usage_mb(), 2),
+                'platform': platform.system(),
+                'python_version': platform.python_version(),
+                'cpu_count': os.cpu_count(),
+            }
         
-        # Re-write report with metrics
-        generator.write_report(report, args.output)
+        # Taken once the provider records and the Parquet signal table are
+        # written, then written as the report's last field
+        metrics = generator.write_report(
+            report, args.output,
+            signal_table_path=args.signal_table,
+            deferred={'execution_metrics': execution_metrics},
+        )['execution_metrics']
         
         # Summary
         logger.info("")
         logger.info("=" * 60)
         logger.info("SUMMARY")
         logger.info("=" * 60)
-        logger.info(f"Total runtime: {elapsed}")
-        logger.info(f"Peak memory: {peak_memory_mb:.2f} MB")
+        logger.info(f"Total runtime: {metrics['total_runtime_human']}")
+        logger.info(f"Peak memory: {metrics['peak_memory_mb']:.2f} MB")
         logger.info(f"Providers scanned: {report['total_providers_scanned']:,}")
         logger.info(f"Providers flagged: {report['total_providers_flagged']:,}")
         logger.info("")
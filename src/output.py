@@ -5,12 +5,22 @@ Formats results according to the competition schema.
 """
 
 import json
-from datetime import datetime
-from typing import List, Dict, Any, Optional
+import os
+from collections import defaultdict
+from collections.abc import Sequence
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import BinaryIO, Callable, List, Dict, Any, Optional
 from dataclasses import asdict
 import duckdb
 import logging
 
+try:
+    import orjson
+except ImportError:  # Fall back to the stdlib encoder
+    orjson = None
+
+from .ingest import PROVIDER_TOTALS_SQL
 from .signals import FraudSignal
 
 logger = logging.getLogger(__name__)
@@ -18,6 +28,35 @@ logger = logging.getLogger(__name__)
 # Version of this tool
 TOOL_VERSION = "1.0.0"
 
+# Buffer for report writes; the default 8 KB means thousands of small
+# write() calls for a large report
+_WRITE_BUFFER_SIZE = 4 * 1024 * 1024
+
+# Signal rows staged in Python before each flush to DuckDB
+_SIGNAL_ROWS_BATCH = 10_000
+
+
+def _json_default(obj: Any) -> Any:
+    """Fallback for values neither encoder handles natively."""
+    if hasattr(obj, 'tolist'):  # NumPy scalars and arrays
+        return obj.tolist()
+    return str(obj)
+
+
+def _dumps(obj: Any) -> bytes:
+    """Serialize one JSON value (orjson when available).
+    
+    Non-string dict keys are stringified as the stdlib encoder does, and
+    NumPy values become plain numbers/lists on both paths.
+    """
+    if orjson is not None:
+        return orjson.dumps(
+            obj,
+            default=_json_default,
+            option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY,
+        )
+    return json.dumps(obj, default=_json_default).encode()
+
 
 def is_valid_npi(npi: str) -> bool:
     """Validate NPI format (10 digits, not all zeros)."""
@@ -29,6 +68,16 @@ def is_valid_npi(npi: str) -> bool:
         return False
     return True
 
+# Signal types in report order
+SIGNAL_TYPES = (
+    "excluded_provider",
+    "billing_outlier",
+    "rapid_escalation",
+    "workforce_impossibility",
+    "shared_official",
+    "geographic_implausibility",
+)
+
 # FCA statute mappings per signal type
 STATUTE_MAPPING = {
     "excluded_provider": "31 U.S.C. § 3729(a)(1)(A)",
@@ -49,59 +98,155 @@ CLAIM_TYPE_MAPPING = {
     "geographic_implausibility": "Reverse false claims - repeated billing on same patients suggests phantom services",
 }
 
+# (claim_type, statute_reference) per signal type, resolved in one lookup
+DEFAULT_FCA = ("Potential false claims violation", "31 U.S.C. § 3729(a)(1)(A)")
+FCA_META = {t: (CLAIM_TYPE_MAPPING[t], STATUTE_MAPPING[t]) for t in STATUTE_MAPPING}
+
+
+def _steps_excluded_provider(npi: str, evidence: Dict, state: Optional[str]) -> List[str]:
+    steps = [
+        f"Verify exclusion status of NPI {npi} in OIG LEIE database",
+        f"Request detailed claims records for {npi} from {evidence.get('exclusion_date', 'exclusion date')} forward",
+        f"Calculate total Medicaid payments to {npi} during exclusion period",
+    ]
+    if state:
+        steps.append(f"Contact {state} Medicaid Fraud Control Unit")
+    return steps
+
+
+def _steps_billing_outlier(npi: str, evidence: Dict, state: Optional[str]) -> List[str]:
+    taxonomy = evidence.get('taxonomy_code', 'unknown')
+    peer_state = evidence.get('state', 'unknown')
+    return [
+        f"Audit claims for NPI {npi} against peer providers in {taxonomy}/{peer_state}",
+        "Request medical records supporting high-volume claims",
+        "Compare service patterns to specialty norms",
+        "Interview beneficiaries to verify services were rendered",
+    ]
+
+
+def _steps_rapid_escalation(npi: str, evidence: Dict, state: Optional[str]) -> List[str]:
+    enum_date = evidence.get('enumeration_date', 'unknown')
+    return [
+        f"Investigate ownership/management of entity NPI {npi} (enumerated {enum_date})",
+        "Review business formation documents and license applications",
+        "Analyze referral patterns for evidence of kickback arrangements",
+        "Compare growth trajectory to legitimate new practices",
+    ]
+
+
+def _steps_workforce_impossibility(npi: str, evidence: Dict, state: Optional[str]) -> List[str]:
+    claims_per_hour = evidence.get('implied_claims_per_hour', 0)
+    return [
+        f"Request employment records and staffing levels for NPI {npi}",
+        f"Verify claimed {claims_per_hour:.1f} claims/hour is humanly possible",
+        "Audit time-of-service documentation for sample claims",
+        "Interview staff and patients regarding actual service delivery",
+    ]
+
+
+def _steps_shared_official(npi: str, evidence: Dict, state: Optional[str]) -> List[str]:
+    official = evidence.get('authorized_official_name', 'unknown')
+    npi_count = evidence.get('controlled_npi_count', 0)
+    return [
+        f"Investigate business relationships among {npi_count} entities controlled by {official}",
+        "Review corporate formation documents for common ownership",
+        "Analyze billing patterns for coordinated fraud indicators",
+        "Examine referral patterns between controlled entities",
+    ]
+
+
+def _steps_geographic_implausibility(npi: str, evidence: Dict, state: Optional[str]) -> List[str]:
+    claim_state = evidence.get('state', 'unknown')
+    codes = evidence.get('flagged_hcpcs_codes', [])
+    return [
+        f"Audit home health claims for NPI {npi} in {claim_state}",
+        "Verify beneficiary addresses and ability to receive home services",
+        f"Request documentation for HCPCS codes: {', '.join(codes[:5])}",
+        "Interview beneficiaries regarding services actually received",
+    ]
+
+
+# Next-step builders per signal type
+_STEP_BUILDERS = {
+    "excluded_provider": _steps_excluded_provider,
+    "billing_outlier": _steps_billing_outlier,
+    "rapid_escalation": _steps_rapid_escalation,
+    "workforce_impossibility": _steps_workforce_impossibility,
+    "shared_official": _steps_shared_official,
+    "geographic_implausibility": _steps_geographic_implausibility,
+}
+
 
 def generate_next_steps(signal: FraudSignal, provider_info: Dict) -> List[str]:
     """Generate specific next steps for a fraud signal."""
-    steps = []
-    npi = signal.npi
-    evidence = signal.evidence
+    return _next_steps(signal, provider_info.get('state'))
+
+
+def _next_steps(signal: FraudSignal, state: Optional[str]) -> List[str]:
+    builder = _STEP_BUILDERS.get(signal.signal_type)
+    if builder is None:
+        return []
+    return builder(signal.npi, signal.evidence, state)[:3]  # Return at least 2, cap at 3
+
+
+def _provider_record(row: tuple, signals: List[FraudSignal]) -> Dict[str, Any]:
+    """Assemble one flagged_providers entry from its joined row and signals."""
+    (npi, provider_name, entity_type, taxonomy_code, state, enumeration_date,
+     total_paid, total_claims, total_beneficiaries, total_overpayment) = row
     
-    if signal.signal_type == "excluded_provider":
-        steps.append(f"Verify exclusion status of NPI {npi} in OIG LEIE database")
-        steps.append(f"Request detailed claims records for {npi} from {evidence.get('exclusion_date', 'exclusion date')} forward")
-        steps.append(f"Calculate total Medicaid payments to {npi} during exclusion period")
-        if provider_info.get('state'):
-            steps.append(f"Contact {provider_info['state']} Medicaid Fraud Control Unit")
-            
-    elif signal.signal_type == "billing_outlier":
-        taxonomy = evidence.get('taxonomy_code', 'unknown')
-        state = evidence.get('state', 'unknown')
-        steps.append(f"Audit claims for NPI {npi} against peer providers in {taxonomy}/{state}")
-        steps.append(f"Request medical records supporting high-volume claims")
-        steps.append(f"Compare service patterns to specialty norms")
-        steps.append(f"Interview beneficiaries to verify services were rendered")
-        
-    elif signal.signal_type == "rapid_escalation":
-        enum_date = evidence.get('enumeration_date', 'unknown')
-        steps.append(f"Investigate ownership/management of entity NPI {npi} (enumerated {enum_date})")
-        steps.append(f"Review business formation documents and license applications")
-        steps.append(f"Analyze referral patterns for evidence of kickback arrangements")
-        steps.append(f"Compare growth trajectory to legitimate new practices")
-        
-    elif signal.signal_type == "workforce_impossibility":
-        claims_per_hour = evidence.get('implied_claims_per_hour', 0)
-        steps.append(f"Request employment records and staffing levels for NPI {npi}")
-        steps.append(f"Verify claimed {claims_per_hour:.1f} claims/hour is humanly possible")
-        steps.append(f"Audit time-of-service documentation for sample claims")
-        steps.append(f"Interview staff and patients regarding actual service delivery")
-        
-    elif signal.signal_type == "shared_official":
-        official = evidence.get('authorized_official_name', 'unknown')
-        npi_count = evidence.get('controlled_npi_count', 0)
-        steps.append(f"Investigate business relationships among {npi_count} entities controlled by {official}")
-        steps.append(f"Review corporate formation documents for common ownership")
-        steps.append(f"Analyze billing patterns for coordinated fraud indicators")
-        steps.append(f"Examine referral patterns between controlled entities")
-        
-    elif signal.signal_type == "geographic_implausibility":
-        state = evidence.get('state', 'unknown')
-        codes = evidence.get('flagged_hcpcs_codes', [])
-        steps.append(f"Audit home health claims for NPI {npi} in {state}")
-        steps.append(f"Verify beneficiary addresses and ability to receive home services")
-        steps.append(f"Request documentation for HCPCS codes: {', '.join(codes[:5])}")
-        steps.append(f"Interview beneficiaries regarding services actually received")
+    # Build signals list
+    signal_entries = []
+    for signal in signals:
+        signal_entries.append({
+            "signal_type": signal.signal_type,
+            "severity": signal.severity,
+            "evidence": signal.evidence,
+        })
     
-    return steps[:3]  # Return at least 2, cap at 3
+    # Get primary signal for FCA reference
+    primary_signal = signals[0]
+    claim_type, statute_reference = FCA_META.get(primary_signal.signal_type, DEFAULT_FCA)
+    
+    return {
+        "npi": npi,
+        "provider_name": provider_name,
+        "entity_type": entity_type,
+        "taxonomy_code": taxonomy_code,
+        "state": state,
+        "enumeration_date": enumeration_date,
+        "total_paid_all_time": total_paid,
+        "total_claims_all_time": total_claims,
+        "total_unique_beneficiaries_all_time": total_beneficiaries,
+        "signals": signal_entries,
+        "estimated_overpayment_usd": total_overpayment,
+        "fca_relevance": {
+            "claim_type": claim_type,
+            "statute_reference": statute_reference,
+            "suggested_next_steps": _next_steps(primary_signal, state),
+        }
+    }
+
+
+class FlaggedProviders(Sequence):
+    """Read-only list of flagged_providers entries, built on access.
+    
+    Holds the ranked provider rows and grouped signals; each entry dict is
+    created when indexed or iterated and not kept.
+    """
+    
+    def __init__(self, rows: List[tuple], provider_signals: Dict[str, List[FraudSignal]]):
+        self._rows = rows
+        self._provider_signals = provider_signals
+    
+    def __len__(self) -> int:
+        return len(self._rows)
+    
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        row = self._rows[index]
+        return _provider_record(row, self._provider_signals[row[0]])
 
 
 class ReportGenerator:
@@ -112,81 +257,172 @@ class ReportGenerator:
         
     def get_provider_info(self, npi: str) -> Dict[str, Any]:
         """Fetch provider details from NPPES."""
-        result = self.conn.execute(f"""
-            SELECT 
+        return self.get_provider_info_batch([npi])[npi]
+    
+    def get_provider_totals(self, npi: str) -> Dict[str, Any]:
+        """Get aggregate billing statistics for a provider."""
+        return self.get_provider_totals_batch([npi])[npi]
+    
+    def get_provider_info_batch(self, npis: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Fetch provider details for many NPIs with one bound query.
+        
+        NPIs missing from NPPES map to an 'Unknown' placeholder.
+        """
+        return {row[0]: self._info_from_row(row) for row in self._fetch_npi_rows(npis)}
+    
+    def get_provider_totals_batch(self, npis: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Get aggregate billing statistics for many NPIs with one bound query.
+        
+        NPIs with no billing rows map to zero totals.
+        """
+        return {row[0]: self._totals_from_row(row) for row in self._fetch_npi_rows(npis)}
+    
+    def _fetch_npi_rows(self, npis: List[str]) -> List[tuple]:
+        """Provider rows for a list of NPIs, in input order."""
+        return self._fetch_provider_rows("""
+            SELECT UNNEST($npis::VARCHAR[]) AS npi, UNNEST(range(len($npis::VARCHAR[]))) AS pos
+        """, {"npis": npis})
+    
+    def _fetch_flagged_rows(self, signals: List[FraudSignal],
+                            top_k: Optional[int] = None) -> List[tuple]:
+        """Provider rows for flagged NPIs, ranked for the report.
+        
+        DuckDB groups the signals per NPI and sums the overpayment in signal
+        order. Rows come back by overpayment descending, ties in order of
+        first appearance, with the overpayment appended. top_k keeps only
+        the first k providers (a bounded Top-N sort); None keeps all.
+        """
+        return self._fetch_provider_rows("""
+            SELECT
                 npi,
-                COALESCE(org_name, last_name || ', ' || first_name) AS provider_name,
-                CASE WHEN entity_type_code = '1' THEN 'individual' ELSE 'organization' END AS entity_type,
-                taxonomy_code,
-                state,
-                enumeration_date
-            FROM nppes
-            WHERE npi = '{npi}'
-        """).fetchone()
+                ROW_NUMBER() OVER (ORDER BY overpayment DESC, first_pos) AS pos,
+                overpayment
+            FROM (
+                SELECT
+                    npi,
+                    SUM(overpayment ORDER BY pos) AS overpayment,
+                    MIN(pos) AS first_pos
+                FROM (
+                    SELECT
+                        UNNEST($npis::VARCHAR[]) AS npi,
+                        UNNEST($overpayments::DOUBLE[]) AS overpayment,
+                        UNNEST(range(len($npis::VARCHAR[]))) AS pos
+                )
+                GROUP BY npi
+                ORDER BY overpayment DESC, first_pos
+                LIMIT $top_k
+            )
+        """, {
+            "npis": [s.npi for s in signals],
+            "overpayments": [s.estimated_overpayment for s in signals],
+            "top_k": top_k,
+        }, extra_columns=", f.overpayment")
+    
+    def _fetch_provider_rows(self, source_sql: str, params: Dict[str, Any],
+                             extra_columns: str = "") -> List[tuple]:
+        """Join NPPES details and all-time totals onto a driving NPI relation.
         
-        if result:
-            return {
-                "npi": result[0],
-                "provider_name": result[1],
-                "entity_type": result[2],
-                "taxonomy_code": result[3],
-                "state": result[4],
-                "enumeration_date": result[5],
-            }
+        source_sql yields (npi, pos, ...); rows come back one per pos, in pos
+        order, as (npi, provider_name, entity_type, taxonomy_code, state,
+        enumeration_date, total_paid, total_claims, total_beneficiaries)
+        followed by any extra_columns taken from it.
+        """
+        self._ensure_provider_totals()
+        return self.conn.execute(f"""
+            SELECT DISTINCT ON (f.pos)
+                f.npi,
+                CASE WHEN n.npi IS NULL THEN 'Unknown' ELSE n.provider_name END AS provider_name,
+                CASE WHEN n.npi IS NULL THEN 'unknown' ELSE n.entity_type END AS entity_type,
+                n.taxonomy_code,
+                n.state,
+                n.enumeration_date,
+                COALESCE(t.total_paid, 0)::DOUBLE AS total_paid,
+                COALESCE(t.total_claims, 0)::BIGINT AS total_claims,
+                COALESCE(t.total_beneficiaries, 0)::BIGINT AS total_beneficiaries{extra_columns}
+            FROM ({source_sql}) f
+            LEFT JOIN nppes n ON n.npi = f.npi
+            LEFT JOIN provider_totals t ON t.npi = f.npi
+            ORDER BY f.pos
+        """, params).fetchall()
+    
+    @staticmethod
+    def _info_from_row(row: tuple) -> Dict[str, Any]:
         return {
-            "npi": npi,
-            "provider_name": "Unknown",
-            "entity_type": "unknown",
-            "taxonomy_code": None,
-            "state": None,
-            "enumeration_date": None,
+            "npi": row[0], "provider_name": row[1], "entity_type": row[2],
+            "taxonomy_code": row[3], "state": row[4], "enumeration_date": row[5]
         }
     
-    def get_provider_totals(self, npi: str) -> Dict[str, Any]:
-        """Get aggregate billing statistics for a provider."""
-        result = self.conn.execute(f"""
-            SELECT 
-                SUM(TOTAL_PAID) AS total_paid,
-                SUM(TOTAL_CLAIMS) AS total_claims,
-                SUM(TOTAL_UNIQUE_BENEFICIARIES) AS total_beneficiaries
-            FROM spending
-            WHERE BILLING_PROVIDER_NPI_NUM = '{npi}'
-        """).fetchone()
-        
-        if result:
-            return {
-                "total_paid_all_time": float(result[0]) if result[0] else 0,
-                "total_claims_all_time": int(result[1]) if result[1] else 0,
-                "total_unique_beneficiaries_all_time": int(result[2]) if result[2] else 0,
-            }
+    @staticmethod
+    def _totals_from_row(row: tuple) -> Dict[str, Any]:
+        # Already typed and zero-filled by the query
         return {
-            "total_paid_all_time": 0,
-            "total_claims_all_time": 0,
-            "total_unique_beneficiaries_all_time": 0,
+            "total_paid_all_time": row[6],
+            "total_claims_all_time": row[7],
+            "total_unique_beneficiaries_all_time": row[8]
         }
     
+    def _ensure_provider_totals(self) -> None:
+        """Make sure the per-provider totals table exists.
+        
+        DataIngestor.load_all() normally builds it already (see
+        build_provider_totals); otherwise it is aggregated here once.
+        spending is a view over Parquet and cannot be indexed, so lookups
+        go through this small indexed table instead.
+        """
+        self.conn.execute(f"CREATE TABLE IF NOT EXISTS provider_totals AS {PROVIDER_TOTALS_SQL}")
+        self.conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_provider_totals_npi ON provider_totals(npi)"
+        )
+    
     def generate_report(
         self, 
         signals_by_type: Dict[str, List[FraudSignal]],
-        output_path: str
+        output_path: str,
+        write: bool = True,
+        top_k: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """Generate the full fraud signals report.
+        
+        Returns the report dict with flagged_providers as a list, written
+        to output_path unless write=False. top_k limits flagged_providers
+        to the k highest estimated overpayments; total_providers_flagged
+        still counts every provider. Use prepare_report() and
+        write_report() to stream a large report without building the list.
+        """
+        report = self.prepare_report(signals_by_type, top_k)
+        report["flagged_providers"] = list(report["flagged_providers"])
+        if write:
+            self.write_report(report, output_path)
+        return report
+    
+    def prepare_report(
+        self,
+        signals_by_type: Dict[str, List[FraudSignal]],
+        top_k: Optional[int] = None
     ) -> Dict[str, Any]:
-        """Generate the full fraud signals report."""
+        """Build the report for streaming with write_report().
+        
+        Same fields as generate_report(), but flagged_providers is a
+        FlaggedProviders sequence whose entries are assembled on access, so
+        writing the report holds one provider record at a time.
+        """
         
         # Get total providers scanned
+        self._ensure_provider_totals()
         total_providers = self.conn.execute(
-            "SELECT COUNT(DISTINCT BILLING_PROVIDER_NPI_NUM) FROM spending"
+            "SELECT COUNT(npi) FROM provider_totals"
         ).fetchone()[0]
         
         # Aggregate signals by provider, filtering invalid NPIs
-        provider_signals: Dict[str, List[FraudSignal]] = {}
+        valid_signals: List[FraudSignal] = []
+        provider_signals: Dict[str, List[FraudSignal]] = defaultdict(list)
         invalid_npi_count = 0
-        for signal_type, signals in signals_by_type.items():
+        for signals in signals_by_type.values():
             for signal in signals:
                 if not is_valid_npi(signal.npi):
                     invalid_npi_count += 1
                     continue
-                if signal.npi not in provider_signals:
-                    provider_signals[signal.npi] = []
+                valid_signals.append(signal)
                 provider_signals[signal.npi].append(signal)
         
         if invalid_npi_count > 0:
@@ -194,161 +430,185 @@ class ReportGenerator:
         
         logger.info(f"Building report for {len(provider_signals)} flagged providers...")
         
-        # Batch fetch provider info and totals for efficiency
-        # Get unique NPIs
-        unique_npis = list(provider_signals.keys())
-        logger.info(f"Batch fetching provider info for {len(unique_npis)} providers...")
-        
-        # Create temp table with flagged NPIs for efficient joins
-        self.conn.execute("CREATE TEMP TABLE IF NOT EXISTS flagged_npis (npi VARCHAR PRIMARY KEY)")
-        # Insert in batches
-        batch_size = 10000
-        for i in range(0, len(unique_npis), batch_size):
-            batch = unique_npis[i:i+batch_size]
-            values = ", ".join([f"('{npi}')" for npi in batch])
-            self.conn.execute(f"INSERT OR IGNORE INTO flagged_npis VALUES {values}")
-        
-        # Batch fetch provider info
-        provider_info_map = {}
-        results = self.conn.execute("""
-            SELECT 
-                n.npi,
-                COALESCE(n.org_name, n.last_name || ', ' || n.first_name) AS provider_name,
-                CASE WHEN n.entity_type_code = '1' THEN 'individual' ELSE 'organization' END AS entity_type,
-                n.taxonomy_code,
-                n.state,
-                n.enumeration_date
-            FROM nppes n
-            INNER JOIN flagged_npis f ON n.npi = f.npi
-        """).fetchall()
-        for row in results:
-            provider_info_map[row[0]] = {
-                "npi": row[0], "provider_name": row[1], "entity_type": row[2],
-                "taxonomy_code": row[3], "state": row[4], "enumeration_date": row[5]
-            }
-        logger.info(f"Fetched info for {len(provider_info_map)} providers")
-        
-        # Batch fetch provider totals
-        provider_totals_map = {}
-        results = self.conn.execute("""
-            SELECT 
-                s.BILLING_PROVIDER_NPI_NUM,
-                SUM(s.TOTAL_PAID),
-                SUM(s.TOTAL_CLAIMS),
-                SUM(s.TOTAL_UNIQUE_BENEFICIARIES)
-            FROM spending s
-            INNER JOIN flagged_npis f ON s.BILLING_PROVIDER_NPI_NUM = f.npi
-            GROUP BY s.BILLING_PROVIDER_NPI_NUM
-        """).fetchall()
-        for row in results:
-            provider_totals_map[row[0]] = {
-                "total_paid_all_time": float(row[1]) if row[1] else 0,
-                "total_claims_all_time": int(row[2]) if row[2] else 0,
-                "total_unique_beneficiaries_all_time": int(row[3]) if row[3] else 0
-            }
-        logger.info(f"Fetched totals for {len(provider_totals_map)} providers")
-        
-        # Cleanup temp table
-        self.conn.execute("DROP TABLE IF EXISTS flagged_npis")
-        
-        # Build flagged providers list
-        flagged_providers = []
-        for npi, signals in provider_signals.items():
-            provider_info = provider_info_map.get(npi, {
-                "npi": npi, "provider_name": "Unknown", "entity_type": "unknown",
-                "taxonomy_code": None, "state": None, "enumeration_date": None
-            })
-            provider_totals = provider_totals_map.get(npi, {
-                "total_paid_all_time": 0, "total_claims_all_time": 0,
-                "total_unique_beneficiaries_all_time": 0
-            })
-            
-            # Calculate total estimated overpayment
-            total_overpayment = sum(s.estimated_overpayment for s in signals)
-            
-            # Build signals list
-            signal_entries = []
-            for signal in signals:
-                next_steps = generate_next_steps(signal, provider_info)
-                
-                signal_entries.append({
-                    "signal_type": signal.signal_type,
-                    "severity": signal.severity,
-                    "evidence": signal.evidence,
-                })
-            
-            # Determine highest severity
-            severities = [s.severity for s in signals]
-            if "critical" in severities:
-                highest_severity = "critical"
-            elif "high" in severities:
-                highest_severity = "high"
-            else:
-                highest_severity = "medium"
-            
-            # Get primary signal for FCA reference
-            primary_signal = signals[0]
-            
-            flagged_providers.append({
-                "npi": npi,
-                "provider_name": provider_info.get("provider_name", "Unknown"),
-                "entity_type": provider_info.get("entity_type", "unknown"),
-                "taxonomy_code": provider_info.get("taxonomy_code"),
-                "state": provider_info.get("state"),
-                "enumeration_date": provider_info.get("enumeration_date"),
-                "total_paid_all_time": provider_totals["total_paid_all_time"],
-                "total_claims_all_time": provider_totals["total_claims_all_time"],
-                "total_unique_beneficiaries_all_time": provider_totals["total_unique_beneficiaries_all_time"],
-                "signals": signal_entries,
-                "estimated_overpayment_usd": total_overpayment,
-                "fca_relevance": {
-                    "claim_type": CLAIM_TYPE_MAPPING.get(
-                        primary_signal.signal_type, 
-                        "Potential false claims violation"
-                    ),
-                    "statute_reference": STATUTE_MAPPING.get(
-                        primary_signal.signal_type,
-                        "31 U.S.C. § 3729(a)(1)(A)"
-                    ),
-                    "suggested_next_steps": generate_next_steps(primary_signal, provider_info),
-                }
-            })
-        
-        # Sort by estimated overpayment descending
-        flagged_providers.sort(key=lambda x: x["estimated_overpayment_usd"], reverse=True)
+        # One query ranks providers by overpayment and joins their details
+        # and totals; ties keep detection order
+        logger.info(f"Batch fetching provider info for {len(provider_signals)} providers...")
+        provider_rows = self._fetch_flagged_rows(valid_signals, top_k)
+        flagged_providers = FlaggedProviders(provider_rows, provider_signals)
         
         # Build signal counts
         signal_counts = {
-            "excluded_provider": len(signals_by_type.get("excluded_provider", [])),
-            "billing_outlier": len(signals_by_type.get("billing_outlier", [])),
-            "rapid_escalation": len(signals_by_type.get("rapid_escalation", [])),
-            "workforce_impossibility": len(signals_by_type.get("workforce_impossibility", [])),
-            "shared_official": len(signals_by_type.get("shared_official", [])),
-            "geographic_implausibility": len(signals_by_type.get("geographic_implausibility", [])),
+            signal_type: len(signals_by_type.get(signal_type, []))
+            for signal_type in SIGNAL_TYPES
         }
         
         # Build final report
         report = {
-            "generated_at": datetime.utcnow().isoformat() + "Z",
+            "generated_at": datetime.now(timezone.utc).isoformat().replace("+00:00", "Z"),
             "tool_version": TOOL_VERSION,
             "total_providers_scanned": total_providers,
-            "total_providers_flagged": len(flagged_providers),
+            "total_providers_flagged": len(provider_signals),
             "signal_counts": signal_counts,
             "flagged_providers": flagged_providers,
         }
         
-        # Write to file
-        with open(output_path, 'w') as f:
-            json.dump(report, f, indent=2, default=str)
-        
-        logger.info(f"Report written to {output_path}")
         logger.info(f"Total providers scanned: {total_providers:,}")
-        logger.info(f"Total providers flagged: {len(flagged_providers):,}")
+        logger.info(f"Total providers flagged: {len(provider_signals):,}")
+        if top_k is not None:
+            logger.info(f"Report lists the top {len(flagged_providers):,} by estimated overpayment")
         
         return report
     
-    def write_report(self, report: Dict[str, Any], output_path: str) -> None:
-        """Write or re-write report to file (e.g., to add execution metrics)."""
-        with open(output_path, 'w') as f:
-            json.dump(report, f, indent=2, default=str)
-        logger.info(f"Report updated with execution metrics: {output_path}")
+    def write_report(
+        self,
+        report: Dict[str, Any],
+        output_path: str,
+        signal_table_path: Optional[str] = None,
+        deferred: Optional[Dict[str, Callable[[], Any]]] = None
+    ) -> Dict[str, Any]:
+        """Write the report JSON and, optionally, its Parquet signal table.
+        
+        Top-level fields keep their order. Each flagged provider is encoded
+        onto its own line, so a FlaggedProviders report is never held in
+        memory as a whole. With signal_table_path, each provider's signals
+        are also staged for a Parquet table (one row per signal). deferred
+        maps extra field names to callables that are evaluated once the
+        provider records and the signal table are written, such as
+        execution metrics; they are written last, after the report's own
+        fields. Returns the evaluated deferred values; report is not
+        modified. Both files go to temporary paths that replace the targets
+        only once complete, so readers never see a partial report.
+        """
+        if signal_table_path is not None and (
+            Path(signal_table_path).resolve() == Path(output_path).resolve()
+        ):
+            raise ValueError(f"Signal table path must differ from the report path: {output_path}")
+        # Parquet key-value header: every report field but the providers
+        header = {k: v for k, v in report.items() if k != 'flagged_providers'}
+        deferred_values: Dict[str, Any] = {}
+        tmp_path = f"{output_path}.tmp"
+        signal_table = (_SignalTableWriter(self.conn)
+                        if signal_table_path is not None else None)
+        try:
+            with open(tmp_path, 'wb', buffering=_WRITE_BUFFER_SIZE) as f:
+                f.write(b'{')
+                for i, (key, value) in enumerate(report.items()):
+                    if i:
+                        f.write(b',')
+                    f.write(b'\n  ' + _dumps(key) + b': ')
+                    if key == 'flagged_providers':
+                        self._write_providers(f, value, signal_table)
+                        if signal_table is not None:
+                            signal_table.write(signal_table_path, header)
+                    else:
+                        f.write(_dumps(value))
+                for key, compute in (deferred or {}).items():
+                    # Evaluated only now, after everything else is written
+                    value = deferred_values[key] = compute()
+                    f.write(b',\n  ' + _dumps(key) + b': ' + _dumps(value))
+                f.write(b'\n}\n')
+            os.replace(tmp_path, output_path)
+        except BaseException:
+            Path(tmp_path).unlink(missing_ok=True)
+            raise
+        finally:
+            if signal_table is not None:
+                signal_table.close()
+        if signal_table is not None:
+            logger.info(f"Signal table written to {signal_table_path}")
+        logger.info(f"Report written to {output_path}")
+        return deferred_values
+    
+    @staticmethod
+    def _write_providers(f: BinaryIO, providers: Sequence,
+                         signal_table: Optional['_SignalTableWriter']) -> None:
+        """Write the flagged_providers array, one encoded record per line."""
+        if not providers:
+            f.write(b'[]')
+            return
+        f.write(b'[')
+        for rank, provider in enumerate(providers):
+            f.write(b'\n    ' if rank == 0 else b',\n    ')
+            f.write(_dumps(provider))
+            if signal_table is not None:
+                signal_table.add(rank, provider)
+        f.write(b'\n  ]')
+
+
+class _SignalTableWriter:
+    """Stages one row per flagged signal and writes them as Parquet.
+    
+    The analysis scripts read this columnar copy of the JSON report
+    instead of re-parsing it. Rows are flushed to a DuckDB temp table in
+    batches, so Python holds at most one batch of them. Header fields are
+    stored as JSON in the Parquet key-value metadata under 'report'.
+    """
+    
+    TABLE = "report_signal_rows"
+    
+    def __init__(self, conn: duckdb.DuckDBPyConnection):
+        self.conn = conn
+        self._columns: Dict[str, List[Any]] = {
+            "provider_rank": [], "npi": [], "signal_index": [],
+            "signal_type": [], "severity": [], "evidence": [],
+        }
+        self.conn.execute(f"""
+            CREATE OR REPLACE TEMP TABLE {self.TABLE} (
+                provider_rank INTEGER,
+                npi VARCHAR,
+                signal_index INTEGER,
+                signal_type VARCHAR,
+                severity VARCHAR,
+                evidence VARCHAR
+            )
+        """)
+    
+    def add(self, rank: int, provider: Dict[str, Any]) -> None:
+        """Stage the signals of one flagged_providers entry."""
+        columns = self._columns
+        for index, signal in enumerate(provider["signals"]):
+            columns["provider_rank"].append(rank)
+            columns["npi"].append(provider["npi"])
+            columns["signal_index"].append(index)
+            columns["signal_type"].append(signal["signal_type"])
+            columns["severity"].append(signal["severity"])
+            columns["evidence"].append(_dumps(signal["evidence"]).decode())
+        if len(columns["npi"]) >= _SIGNAL_ROWS_BATCH:
+            self._flush()
+    
+    def _flush(self) -> None:
+        # Python lists bind as LIST parameters; unnesting them side by side
+        # rebuilds the rows without needing pyarrow or pandas
+        if not self._columns["npi"]:
+            return
+        self.conn.execute(f"""
+            INSERT INTO {self.TABLE}
+            SELECT
+                UNNEST($provider_rank::INTEGER[]),
+                UNNEST($npi::VARCHAR[]),
+                UNNEST($signal_index::INTEGER[]),
+                UNNEST($signal_type::VARCHAR[]),
+                UNNEST($severity::VARCHAR[]),
+                UNNEST($evidence::VARCHAR[])
+        """, self._columns)
+        for values in self._columns.values():
+            values.clear()
+    
+    def write(self, path: str, header: Dict[str, Any]) -> None:
+        """Write every staged row to path, via a temporary file."""
+        self._flush()
+        tmp_path = f"{path}.tmp"
+        try:
+            self.conn.execute(f"""
+                COPY (
+                    SELECT * FROM {self.TABLE} ORDER BY provider_rank, signal_index
+                ) TO $path (FORMAT PARQUET, CODEC 'zstd', KV_METADATA {{report: $header}})
+            """, {"path": tmp_path, "header": _dumps(header).decode()})
+            os.replace(tmp_path, path)
+        except BaseException:
+            Path(tmp_path).unlink(missing_ok=True)
+            raise
+    
+    def close(self) -> None:
+        """Drop the staging table."""
+        self.conn.execute(f"DROP TABLE IF EXISTS {self.TABLE}")
@@ -5,15 +5,34 @@ Each signal has a precise definition from the competition spec.
 """
 
 import duckdb
-from typing import List, Dict, Any
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Iterator, List, Dict, Any
 from dataclasses import dataclass
 from datetime import date
 import logging
 
+from .ingest import PROVIDER_MONTHLY_SQL, PROVIDER_TOTALS_SQL, DataIngestor
+
 logger = logging.getLogger(__name__)
 
+# Rows converted to Python objects at a time when reading detector results
+FETCH_BATCH_ROWS = 10_000
+
+
+def _iter_rows(result: duckdb.DuckDBPyConnection) -> Iterator[tuple]:
+    """Yield a query's rows in batches instead of one fetchall() list.
+    
+    Only one batch of row tuples is alive at a time, so a detector's peak
+    memory is its signals plus a batch rather than signals plus every row.
+    """
+    while True:
+        rows = result.fetchmany(FETCH_BATCH_ROWS)
+        if not rows:
+            return
+        yield from rows
+
 
-@dataclass
+@dataclass(slots=True)
 class FraudSignal:
     """Represents a detected fraud signal for a provider."""
     npi: str
@@ -39,8 +58,38 @@ class SignalDetector:
         'T1019', 'T1020', 'T1021', 'T1022'
     ]
     
-    def __init__(self, conn: duckdb.DuckDBPyConnection):
+    def __init__(self, conn: duckdb.DuckDBPyConnection, ensure_tables: bool = True):
         self.conn = conn
+        # Per-thread cursor detectors pass False: the parent detector has
+        # already built the shared tables in the catalog they all see
+        if ensure_tables:
+            self._ensure_rollups()
+            self._ensure_official_keys()
+        
+    def _ensure_rollups(self) -> None:
+        """Make sure the per-provider spending rollups exist.
+        
+        DataIngestor.load_all() normally builds them already; otherwise they
+        are aggregated here once so each signal does not rescan spending.
+        """
+        self.conn.execute(f"CREATE TABLE IF NOT EXISTS provider_totals AS {PROVIDER_TOTALS_SQL}")
+        self.conn.execute(f"CREATE TABLE IF NOT EXISTS provider_monthly AS {PROVIDER_MONTHLY_SQL}")
+        
+    def _ensure_official_keys(self) -> None:
+        """Expose each NPI's normalized authorized-official key to Signal 5.
+        
+        DataIngestor's nppes view already carries official_key; for an nppes
+        relation without it the same expression is resolved here, once, so
+        the detector query itself stays static.
+        """
+        nppes_columns = {row[0] for row in self.conn.execute("DESCRIBE nppes").fetchall()}
+        official_key = ('official_key' if 'official_key' in nppes_columns
+                        else DataIngestor.NPPES_DERIVED['official_key'])
+        self.conn.execute(f"""
+            CREATE OR REPLACE VIEW nppes_officials AS
+            SELECT npi, auth_official_last, auth_official_first, {official_key} AS official_key
+            FROM nppes
+        """)
         
     def detect_signal_1_excluded_provider(self) -> List[FraudSignal]:
         """
@@ -52,47 +101,66 @@ class SignalDetector:
         """
         logger.info("Detecting Signal 1: Excluded Provider Still Billing")
         
-        results = self.conn.execute("""
-            WITH excluded_billing AS (
-                -- Check billing NPIs
-                SELECT DISTINCT
-                    s.BILLING_PROVIDER_NPI_NUM AS npi,
-                    l.EXCLDATE,
-                    l.EXCLTYPE,
-                    l.REINDATE,
-                    MIN(s.CLAIM_FROM_MONTH) AS first_post_exclusion_month,
-                    SUM(s.TOTAL_PAID) AS total_paid_after_exclusion
+        results = _iter_rows(self.conn.execute("""
+            WITH excluded_npis AS (
+                SELECT DISTINCT NPI
+                FROM leie
+                WHERE NPI IS NOT NULL AND NPI != '' AND EXCLDATE IS NOT NULL
+            ),
+            claim_npis AS (
+                -- One pass over spending: each claim row yields its billing
+                -- and its servicing NPI, tagged with the role. Rows touching
+                -- no excluded NPI are dropped first by semi-joins against the
+                -- small LEIE set, so only candidates get unnested and joined.
+                SELECT
+                    UNNEST([s.BILLING_PROVIDER_NPI_NUM, s.SERVICING_PROVIDER_NPI_NUM]) AS npi,
+                    UNNEST(['billing', 'servicing']) AS npi_role,
+                    s.CLAIM_FROM_MONTH,
+                    s.TOTAL_PAID
                 FROM spending s
-                JOIN leie l ON s.BILLING_PROVIDER_NPI_NUM = l.NPI
-                WHERE l.NPI IS NOT NULL 
-                    AND l.NPI != ''
-                    AND l.EXCLDATE IS NOT NULL
-                    AND CAST(s.CLAIM_FROM_MONTH || '-01' AS DATE) >= l.EXCLDATE
-                    AND (l.REINDATE IS NULL OR CAST(s.CLAIM_FROM_MONTH || '-01' AS DATE) < l.REINDATE)
-                GROUP BY s.BILLING_PROVIDER_NPI_NUM, l.EXCLDATE, l.EXCLTYPE, l.REINDATE
-                
-                UNION
-                
-                -- Check servicing NPIs
-                SELECT DISTINCT
-                    s.SERVICING_PROVIDER_NPI_NUM AS npi,
+                WHERE s.BILLING_PROVIDER_NPI_NUM IN (SELECT NPI FROM excluded_npis)
+                    OR s.SERVICING_PROVIDER_NPI_NUM IN (SELECT NPI FROM excluded_npis)
+            ),
+            excluded_by_role AS (
+                SELECT
+                    c.npi,
+                    c.npi_role,
                     l.EXCLDATE,
                     l.EXCLTYPE,
                     l.REINDATE,
-                    MIN(s.CLAIM_FROM_MONTH) AS first_post_exclusion_month,
-                    SUM(s.TOTAL_PAID) AS total_paid_after_exclusion
-                FROM spending s
-                JOIN leie l ON s.SERVICING_PROVIDER_NPI_NUM = l.NPI
+                    MIN(c.CLAIM_FROM_MONTH) AS first_post_exclusion_month,
+                    SUM(c.TOTAL_PAID) AS total_paid_after_exclusion
+                FROM claim_npis c
+                JOIN leie l ON c.npi = l.NPI
                 WHERE l.NPI IS NOT NULL 
                     AND l.NPI != ''
                     AND l.EXCLDATE IS NOT NULL
-                    AND CAST(s.CLAIM_FROM_MONTH || '-01' AS DATE) >= l.EXCLDATE
-                    AND (l.REINDATE IS NULL OR CAST(s.CLAIM_FROM_MONTH || '-01' AS DATE) < l.REINDATE)
-                GROUP BY s.SERVICING_PROVIDER_NPI_NUM, l.EXCLDATE, l.EXCLTYPE, l.REINDATE
+                    AND CAST(c.CLAIM_FROM_MONTH || '-01' AS DATE) >= l.EXCLDATE
+                    AND (l.REINDATE IS NULL OR CAST(c.CLAIM_FROM_MONTH || '-01' AS DATE) < l.REINDATE)
+                GROUP BY c.npi, c.npi_role, l.EXCLDATE, l.EXCLTYPE, l.REINDATE
+            ),
+            excluded_billing AS (
+                -- Same rows the billing/servicing UNION produced: identical
+                -- results for both roles collapse into one
+                SELECT DISTINCT
+                    npi,
+                    EXCLDATE,
+                    EXCLTYPE,
+                    REINDATE,
+                    first_post_exclusion_month,
+                    total_paid_after_exclusion
+                FROM excluded_by_role
             )
-            SELECT * FROM excluded_billing
+            SELECT
+                npi,
+                CAST(EXCLDATE AS VARCHAR),
+                EXCLTYPE,
+                CAST(REINDATE AS VARCHAR),
+                CAST(first_post_exclusion_month AS VARCHAR),
+                COALESCE(total_paid_after_exclusion, 0)::DOUBLE
+            FROM excluded_billing
             ORDER BY total_paid_after_exclusion DESC
-        """).fetchall()
+        """))
         
         signals = []
         for row in results:
@@ -103,13 +171,13 @@ class SignalDetector:
                 signal_type="excluded_provider",
                 severity="critical",  # Always critical per spec
                 evidence={
-                    "exclusion_date": str(excl_date) if excl_date else None,
+                    "exclusion_date": excl_date,
                     "exclusion_type": excl_type,
-                    "reinstatement_date": str(rein_date) if rein_date else None,
-                    "first_post_exclusion_billing": str(first_month) if first_month else None,
-                    "total_paid_after_exclusion": float(total_paid) if total_paid else 0
+                    "reinstatement_date": rein_date,
+                    "first_post_exclusion_billing": first_month,
+                    "total_paid_after_exclusion": total_paid
                 },
-                estimated_overpayment=float(total_paid) if total_paid else 0
+                estimated_overpayment=total_paid
             ))
         
         logger.info(f"Signal 1: Found {len(signals)} excluded providers still billing")
@@ -124,15 +192,8 @@ class SignalDetector:
         """
         logger.info("Detecting Signal 2: Billing Volume Outlier")
         
-        results = self.conn.execute("""
-            WITH provider_totals AS (
-                SELECT 
-                    BILLING_PROVIDER_NPI_NUM AS npi,
-                    SUM(TOTAL_PAID) AS total_paid
-                FROM spending
-                GROUP BY BILLING_PROVIDER_NPI_NUM
-            ),
-            provider_with_taxonomy AS (
+        results = _iter_rows(self.conn.execute("""
+            WITH provider_with_taxonomy AS (
                 SELECT 
                     pt.npi,
                     pt.total_paid,
@@ -141,51 +202,69 @@ class SignalDetector:
                 FROM provider_totals pt
                 LEFT JOIN nppes n ON pt.npi = n.npi
             ),
-            peer_stats AS (
+            peer_groups AS (
+                -- Only meaningful peer groups; sized first so no quantile
+                -- work is spent on the many small groups that get dropped
+                SELECT taxonomy_code, state
+                FROM provider_with_taxonomy
+                GROUP BY taxonomy_code, state
+                HAVING COUNT(*) >= 10
+            ),
+            peer_quantiles AS (
+                -- Both quantiles from one aggregate state: each group's values
+                -- are collected once and selected (not sorted) for each cut
                 SELECT 
                     taxonomy_code,
                     state,
-                    PERCENTILE_CONT(0.5) WITHIN GROUP (ORDER BY total_paid) AS peer_median,
-                    PERCENTILE_CONT(0.99) WITHIN GROUP (ORDER BY total_paid) AS peer_99th
+                    QUANTILE_CONT(total_paid, [0.5, 0.99]) AS quantiles
                 FROM provider_with_taxonomy
+                JOIN peer_groups USING (taxonomy_code, state)
                 GROUP BY taxonomy_code, state
-                HAVING COUNT(*) >= 10  -- Only meaningful peer groups
+            ),
+            peer_stats AS (
+                SELECT 
+                    taxonomy_code,
+                    state,
+                    quantiles[1] AS peer_median,
+                    quantiles[2] AS peer_99th
+                FROM peer_quantiles
             )
             SELECT 
                 p.npi,
-                p.total_paid,
+                p.total_paid::DOUBLE,
                 p.taxonomy_code,
                 p.state,
-                ps.peer_median,
-                ps.peer_99th,
-                p.total_paid / NULLIF(ps.peer_median, 0) AS ratio_to_median
+                COALESCE(ps.peer_median, 0)::DOUBLE,
+                ps.peer_99th::DOUBLE,
+                COALESCE(p.total_paid / NULLIF(ps.peer_median, 0), 0)::DOUBLE AS ratio_to_median,
+                -- Severity: high if ratio > 5x, else medium
+                CASE WHEN ratio_to_median > 5 THEN 'high' ELSE 'medium' END AS severity,
+                -- Estimated overpayment: (provider_total - peer_99th), floored at 0
+                CASE WHEN p.total_paid <> 0 AND ps.peer_99th <> 0
+                    THEN GREATEST(p.total_paid - ps.peer_99th, 0)
+                    ELSE 0
+                END::DOUBLE AS overpayment
             FROM provider_with_taxonomy p
             JOIN peer_stats ps ON p.taxonomy_code = ps.taxonomy_code AND p.state = ps.state
             WHERE p.total_paid > ps.peer_99th
             ORDER BY p.total_paid DESC
-        """).fetchall()
+        """))
         
         signals = []
         for row in results:
-            npi, total, taxonomy, state, median, p99, ratio = row
-            
-            # Severity: high if ratio > 5x, else medium
-            severity = "high" if ratio and ratio > 5 else "medium"
-            
-            # Estimated overpayment: (provider_total - peer_99th), floored at 0
-            overpayment = max(0, float(total) - float(p99)) if total and p99 else 0
+            npi, total, taxonomy, state, median, p99, ratio, severity, overpayment = row
             
             signals.append(FraudSignal(
                 npi=npi,
                 signal_type="billing_outlier",
                 severity=severity,
                 evidence={
-                    "total_paid": float(total) if total else 0,
+                    "total_paid": total,
                     "taxonomy_code": taxonomy,
                     "state": state,
-                    "peer_group_median": float(median) if median else 0,
-                    "peer_group_99th_percentile": float(p99) if p99 else 0,
-                    "ratio_to_peer_median": float(ratio) if ratio else 0
+                    "peer_group_median": median,
+                    "peer_group_99th_percentile": p99,
+                    "ratio_to_peer_median": ratio
                 },
                 estimated_overpayment=overpayment
             ))
@@ -202,13 +281,13 @@ class SignalDetector:
         """
         logger.info("Detecting Signal 3: Rapid Billing Escalation")
         
-        results = self.conn.execute("""
+        results = _iter_rows(self.conn.execute("""
             WITH provider_first_billing AS (
                 SELECT 
-                    BILLING_PROVIDER_NPI_NUM AS npi,
+                    npi,
                     MIN(CLAIM_FROM_MONTH) AS first_billing_month
-                FROM spending
-                GROUP BY BILLING_PROVIDER_NPI_NUM
+                FROM provider_monthly
+                GROUP BY npi
             ),
             -- Join with NPPES to get enumeration date, filter to "new" providers
             -- NPPES date format is MM/DD/YYYY, need to parse with strptime
@@ -216,9 +295,7 @@ class SignalDetector:
                 SELECT 
                     pfb.npi,
                     pfb.first_billing_month,
-                    n.enumeration_date,
-                    TRY_STRPTIME(n.enumeration_date, '%m/%d/%Y') AS enum_date_parsed,
-                    CAST(pfb.first_billing_month || '-01' AS DATE) AS first_billing_date
+                    n.enumeration_date
                 FROM provider_first_billing pfb
                 INNER JOIN nppes n ON pfb.npi = n.npi
                 WHERE n.enumeration_date IS NOT NULL
@@ -229,99 +306,81 @@ class SignalDetector:
                     AND TRY_STRPTIME(n.enumeration_date, '%m/%d/%Y') <= 
                         CAST(pfb.first_billing_month || '-01' AS DATE)
             ),
-            -- Get monthly billing for first 12 months only
-            monthly_billing AS (
+            -- Monthly paid amounts for the first 12 billing months, in order,
+            -- one row per provider
+            monthly_series AS (
                 SELECT 
                     np.npi,
                     np.enumeration_date,
                     np.first_billing_month,
-                    s.CLAIM_FROM_MONTH,
-                    SUM(s.TOTAL_PAID) AS monthly_paid,
-                    ROW_NUMBER() OVER (PARTITION BY np.npi ORDER BY s.CLAIM_FROM_MONTH) AS month_num
+                    LIST(pm.total_paid ORDER BY pm.CLAIM_FROM_MONTH)[1:12] AS series
                 FROM new_providers np
-                INNER JOIN spending s ON np.npi = s.BILLING_PROVIDER_NPI_NUM
-                WHERE s.CLAIM_FROM_MONTH >= np.first_billing_month
-                GROUP BY np.npi, np.enumeration_date, np.first_billing_month, s.CLAIM_FROM_MONTH
-            ),
-            first_12_months AS (
-                SELECT * FROM monthly_billing WHERE month_num <= 12
+                INNER JOIN provider_monthly pm ON np.npi = pm.npi
+                WHERE pm.CLAIM_FROM_MONTH >= np.first_billing_month
+                GROUP BY np.npi, np.enumeration_date, np.first_billing_month
             ),
-            -- Calculate month-over-month growth
+            -- Month-over-month growth, skipping months whose previous month
+            -- paid nothing (no defined growth rate)
             with_growth AS (
                 SELECT 
                     npi,
                     enumeration_date,
                     first_billing_month,
-                    CLAIM_FROM_MONTH,
-                    monthly_paid,
-                    month_num,
-                    LAG(monthly_paid) OVER (PARTITION BY npi ORDER BY month_num) AS prev_paid,
-                    CASE 
-                        WHEN LAG(monthly_paid) OVER (PARTITION BY npi ORDER BY month_num) > 0
-                        THEN (monthly_paid - LAG(monthly_paid) OVER (PARTITION BY npi ORDER BY month_num)) 
-                            / LAG(monthly_paid) OVER (PARTITION BY npi ORDER BY month_num) * 100
-                        ELSE NULL
-                    END AS growth_pct
-                FROM first_12_months
+                    series,
+                    list_filter(
+                        list_transform(
+                            range(2, len(series) + 1),
+                            lambda i: CASE WHEN series[i - 1] > 0
+                                THEN (series[i] - series[i - 1]) / series[i - 1] * 100
+                            END
+                        ),
+                        lambda g: g IS NOT NULL
+                    ) AS growth
+                FROM monthly_series
             ),
-            -- Calculate rolling 3-month average growth
+            -- Rolling 3-month average growth, computed on each list in place
+            -- instead of re-sorting windows per partition
             rolling_avg AS (
                 SELECT 
                     npi,
                     enumeration_date,
                     first_billing_month,
-                    month_num,
-                    AVG(growth_pct) OVER (
-                        PARTITION BY npi 
-                        ORDER BY month_num 
-                        ROWS BETWEEN 2 PRECEDING AND CURRENT ROW
+                    series,
+                    list_transform(
+                        range(1, len(growth) + 1),
+                        lambda i: list_avg(growth[greatest(1, i - 2):i])
                     ) AS rolling_3mo_growth
                 FROM with_growth
-                WHERE growth_pct IS NOT NULL
-            ),
-            -- Flag providers with rolling 3-month average > 200%
-            flagged AS (
-                SELECT DISTINCT
-                    npi,
-                    enumeration_date,
-                    first_billing_month,
-                    MAX(rolling_3mo_growth) AS peak_3mo_growth
-                FROM rolling_avg
-                WHERE rolling_3mo_growth > 200
-                GROUP BY npi, enumeration_date, first_billing_month
             )
             SELECT 
-                f.npi,
-                f.enumeration_date,
-                f.first_billing_month,
-                f.peak_3mo_growth,
-                ARRAY_AGG(mb.monthly_paid ORDER BY mb.month_num) AS monthly_amounts,
-                SUM(mb.monthly_paid) AS total_first_12
-            FROM flagged f
-            INNER JOIN first_12_months mb ON f.npi = mb.npi
-            GROUP BY f.npi, f.enumeration_date, f.first_billing_month, f.peak_3mo_growth
-            ORDER BY f.peak_3mo_growth DESC
-        """).fetchall()
+                npi,
+                enumeration_date,
+                CAST(first_billing_month AS VARCHAR),
+                list_max(rolling_3mo_growth)::DOUBLE AS peak_3mo_growth,
+                list_transform(series, lambda x: COALESCE(x, 0))::DOUBLE[] AS monthly_amounts,
+                -- Severity: high if growth > 500%, else medium
+                CASE WHEN peak_3mo_growth > 500 THEN 'high' ELSE 'medium' END AS severity,
+                -- Estimated overpayment: total paid in the first 12 months
+                COALESCE(list_sum(series), 0)::DOUBLE AS total_first_12
+            FROM rolling_avg
+            -- Flag providers with rolling 3-month average > 200%
+            WHERE list_max(rolling_3mo_growth) > 200
+            ORDER BY peak_3mo_growth DESC
+        """))
         
         signals = []
         for row in results:
-            npi, enum_date, first_month, peak_growth, monthly_amounts, total = row
-            
-            # Severity: high if growth > 500%, else medium
-            severity = "high" if peak_growth and peak_growth > 500 else "medium"
-            
-            # Estimated overpayment: total paid in months where growth exceeded 200%
-            overpayment = float(total) if total else 0
+            npi, enum_date, first_month, peak_growth, monthly_amounts, severity, overpayment = row
             
             signals.append(FraudSignal(
                 npi=npi,
                 signal_type="rapid_escalation",
                 severity=severity,
                 evidence={
-                    "enumeration_date": str(enum_date) if enum_date else None,
-                    "first_billing_month": str(first_month) if first_month else None,
-                    "monthly_paid_first_12": [float(x) if x else 0 for x in monthly_amounts] if monthly_amounts else [],
-                    "peak_3_month_growth_rate_pct": float(peak_growth) if peak_growth else 0
+                    "enumeration_date": enum_date,
+                    "first_billing_month": first_month,
+                    "monthly_paid_first_12": monthly_amounts,
+                    "peak_3_month_growth_rate_pct": peak_growth
                 },
                 estimated_overpayment=overpayment
             ))
@@ -335,75 +394,65 @@ class SignalDetector:
         
         Definition: For organizations (Entity Type = 2), if max monthly claims
         implies > 6 claims per hour (claims / 22 days / 8 hours > 6).
-        
-        Optimized: Use temp tables and staged aggregation.
         """
         logger.info("Detecting Signal 4: Workforce Impossibility")
         
-        # Step 1: Get organization NPIs (entity type 2)
-        self.conn.execute("""
-            CREATE TEMP TABLE IF NOT EXISTS org_npis AS
-            SELECT DISTINCT npi FROM nppes WHERE entity_type_code = '2'
-        """)
-        
-        # Step 2: Aggregate monthly claims only for orgs, filtering early
-        # Threshold: 6 claims/hr * 8 hrs * 22 days = 1056 claims/month
-        self.conn.execute("""
-            CREATE TEMP TABLE IF NOT EXISTS monthly_claims AS
-            SELECT 
-                s.BILLING_PROVIDER_NPI_NUM AS npi,
-                s.CLAIM_FROM_MONTH,
-                SUM(s.TOTAL_CLAIMS) AS month_claims,
-                SUM(s.TOTAL_PAID) AS month_paid
-            FROM spending s
-            INNER JOIN org_npis o ON s.BILLING_PROVIDER_NPI_NUM = o.npi
-            GROUP BY s.BILLING_PROVIDER_NPI_NUM, s.CLAIM_FROM_MONTH
-            HAVING SUM(s.TOTAL_CLAIMS) > 1056
-        """)
-        
-        # Step 3: Find max month per NPI and get results
-        results = self.conn.execute("""
-            WITH max_per_npi AS (
-                SELECT npi, MAX(month_claims) AS max_claims
+        results = _iter_rows(self.conn.execute("""
+            WITH org_npis AS (
+                -- Organization NPIs (entity type 2)
+                SELECT DISTINCT npi FROM nppes WHERE entity_type_code = '2'
+            ),
+            monthly_claims AS (
+                -- Org months over the threshold, from the monthly rollup
+                -- Threshold: 6 claims/hr * 8 hrs * 22 days = 1056 claims/month
+                SELECT 
+                    pm.npi,
+                    pm.CLAIM_FROM_MONTH,
+                    pm.total_claims AS month_claims,
+                    pm.total_paid AS month_paid
+                FROM provider_monthly pm
+                INNER JOIN org_npis o ON pm.npi = o.npi
+                WHERE pm.total_claims > 1056
+            ),
+            -- Peak month per NPI in a single aggregate pass
+            peaks AS (
+                SELECT 
+                    npi,
+                    MAX(month_claims) AS peak_claims,
+                    -- Row with the most claims; ties go to the earliest month
+                    ARG_MIN(
+                        {'month': CLAIM_FROM_MONTH, 'paid': month_paid},
+                        (-month_claims, CLAIM_FROM_MONTH)
+                    ) AS peak
                 FROM monthly_claims
                 GROUP BY npi
             )
             SELECT 
-                mc.npi,
-                mc.CLAIM_FROM_MONTH AS peak_month,
-                mc.month_claims AS peak_claims,
-                mc.month_paid AS peak_paid,
-                mc.month_claims / 22.0 / 8.0 AS claims_per_hour
-            FROM monthly_claims mc
-            JOIN max_per_npi m ON mc.npi = m.npi AND mc.month_claims = m.max_claims
+                npi,
+                CAST(peak.month AS VARCHAR) AS peak_month,
+                peak_claims::BIGINT AS peak_claims,
+                COALESCE(peak.paid, 0)::DOUBLE AS peak_paid,
+                (peak_claims / 22.0 / 8.0)::DOUBLE AS claims_per_hour,
+                -- Estimated overpayment: (peak_claims - threshold) * avg_claim_value
+                -- threshold = 6 * 8 * 22 = 1056 claims
+                (GREATEST(peak_claims - 1056, 0) * (peak_paid / peak_claims))::DOUBLE AS overpayment
+            FROM peaks
             ORDER BY claims_per_hour DESC
-
-        """).fetchall()
-        
-        # Cleanup
-        self.conn.execute("DROP TABLE IF EXISTS org_npis")
-        self.conn.execute("DROP TABLE IF EXISTS monthly_claims")
+        """))
         
         signals = []
         for row in results:
-            npi, peak_month, peak_claims, peak_paid, claims_per_hour = row
-            
-            # Estimated overpayment: (peak_claims - threshold) * avg_claim_value
-            # threshold = 6 * 8 * 22 = 1056 claims
-            threshold = 6 * 8 * 22
-            excess_claims = max(0, int(peak_claims) - threshold)
-            avg_claim_value = float(peak_paid) / float(peak_claims) if peak_claims else 0
-            overpayment = excess_claims * avg_claim_value
+            npi, peak_month, peak_claims, peak_paid, claims_per_hour, overpayment = row
             
             signals.append(FraudSignal(
                 npi=npi,
                 signal_type="workforce_impossibility",
                 severity="high",  # Always high per spec
                 evidence={
-                    "peak_month": str(peak_month) if peak_month else None,
-                    "peak_claims_count": int(peak_claims) if peak_claims else 0,
-                    "implied_claims_per_hour": float(claims_per_hour) if claims_per_hour else 0,
-                    "total_paid_peak_month": float(peak_paid) if peak_paid else 0
+                    "peak_month": peak_month,
+                    "peak_claims_count": peak_claims,
+                    "implied_claims_per_hour": claims_per_hour,
+                    "total_paid_peak_month": peak_paid
                 },
                 estimated_overpayment=overpayment
             ))
@@ -418,77 +467,44 @@ class SignalDetector:
         Definition: Same authorized official controls 5+ NPIs with 
         combined total > $1,000,000.
         
-        Optimized: Avoid UNNEST/ARRAY operations by using simple JOINs.
+        One grouped query over the official key; the evidence lists the
+        official's first ten NPIs in NPI order.
         """
         logger.info("Detecting Signal 5: Shared Authorized Official")
         
-        # Step 1: Pre-aggregate NPI totals to reduce data size
-        self.conn.execute("""
-            CREATE TEMP TABLE IF NOT EXISTS npi_totals AS
-            SELECT 
-                BILLING_PROVIDER_NPI_NUM AS npi,
-                SUM(TOTAL_PAID) AS total_paid
-            FROM spending
-            GROUP BY BILLING_PROVIDER_NPI_NUM
-        """)
-        
-        # Step 2: Create official key for each NPI
-        self.conn.execute("""
-            CREATE TEMP TABLE IF NOT EXISTS official_npis AS
-            SELECT 
-                UPPER(TRIM(COALESCE(CAST(auth_official_last AS VARCHAR), ''))) || '|' || 
-                UPPER(TRIM(COALESCE(CAST(auth_official_first AS VARCHAR), ''))) AS official_key,
-                auth_official_last,
-                auth_official_first,
-                npi
-            FROM nppes
-            WHERE auth_official_last IS NOT NULL 
-                AND TRIM(CAST(auth_official_last AS VARCHAR)) != ''
-                AND auth_official_first IS NOT NULL
-                AND TRIM(CAST(auth_official_first AS VARCHAR)) != ''
-        """)
-        
-        # Step 3: Join with spending and aggregate by official
-        results = self.conn.execute("""
+        # Join with NPI totals and aggregate by official
+        results = _iter_rows(self.conn.execute("""
             SELECT 
-                o.official_key,
                 o.auth_official_last,
                 o.auth_official_first,
                 COUNT(DISTINCT o.npi) AS npi_count,
-                STRING_AGG(DISTINCT o.npi, ',') AS npi_list_str,
-                SUM(COALESCE(nt.total_paid, 0)) AS combined_total
-            FROM official_npis o
-            LEFT JOIN npi_totals nt ON o.npi = nt.npi
+                -- The first NPI is the signal's primary NPI; only 10 are reported
+                LIST(DISTINCT o.npi ORDER BY o.npi)[1:10] AS npi_list,
+                SUM(COALESCE(nt.total_paid, 0))::DOUBLE AS combined_total,
+                -- Severity: high if combined > $5M, else medium
+                CASE WHEN combined_total > 5000000 THEN 'high' ELSE 'medium' END AS severity
+            FROM nppes_officials o
+            LEFT JOIN provider_totals nt ON o.npi = nt.npi
+            WHERE o.official_key IS NOT NULL
             GROUP BY o.official_key, o.auth_official_last, o.auth_official_first
             HAVING COUNT(DISTINCT o.npi) >= 5
                 AND SUM(COALESCE(nt.total_paid, 0)) > 1000000
             ORDER BY combined_total DESC
-
-        """).fetchall()
-        
-        # Cleanup temp tables
-        self.conn.execute("DROP TABLE IF EXISTS npi_totals")
-        self.conn.execute("DROP TABLE IF EXISTS official_npis")
+        """))
         
         signals = []
         for row in results:
-            official_key, last_name, first_name, npi_count, npi_list_str, combined = row
-            
-            # Parse NPI list from comma-separated string
-            npi_list = npi_list_str.split(',') if npi_list_str else []
-            
-            # Severity: high if combined > $5M, else medium
-            severity = "high" if combined and combined > 5000000 else "medium"
+            last_name, first_name, npi_count, npi_list, combined, severity = row
             
             signals.append(FraudSignal(
-                npi=npi_list[0] if npi_list else "",  # Primary NPI for the signal
+                npi=npi_list[0],  # Primary NPI for the signal
                 signal_type="shared_official",
                 severity=severity,
                 evidence={
                     "authorized_official_name": f"{first_name} {last_name}",
-                    "controlled_npi_count": int(npi_count) if npi_count else 0,
-                    "controlled_npis": npi_list[:10],  # Limit to first 10 for output
-                    "combined_total_paid": float(combined) if combined else 0
+                    "controlled_npi_count": npi_count,
+                    "controlled_npis": npi_list,
+                    "combined_total_paid": combined
                 },
                 estimated_overpayment=0  # Not estimated per spec
             ))
@@ -505,38 +521,38 @@ class SignalDetector:
         """
         logger.info("Detecting Signal 6: Geographic Implausibility")
         
-        # Build the HCPCS code list for SQL
-        codes = "','".join(self.HOME_HEALTH_CODES)
-        
-        results = self.conn.execute(f"""
-            WITH home_health_billing AS (
+        # The code list is bound as a parameter; the IN-subquery becomes a
+        # hash semi-join instead of a per-row chain of string comparisons
+        results = _iter_rows(self.conn.execute("""
+            WITH home_health_months AS (
+                -- One row per provider-month across all home health codes, so
+                -- the thresholds apply to the month's combined volume
                 SELECT 
                     s.BILLING_PROVIDER_NPI_NUM AS npi,
                     n.state,
-                    s.HCPCS_CODE,
+                    ARRAY_AGG(DISTINCT s.HCPCS_CODE ORDER BY s.HCPCS_CODE) AS flagged_codes,
                     s.CLAIM_FROM_MONTH,
                     SUM(s.TOTAL_CLAIMS) AS monthly_claims,
                     SUM(s.TOTAL_UNIQUE_BENEFICIARIES) AS monthly_beneficiaries,
                     SUM(s.TOTAL_UNIQUE_BENEFICIARIES) * 1.0 / NULLIF(SUM(s.TOTAL_CLAIMS), 0) AS ratio
                 FROM spending s
                 JOIN nppes n ON s.BILLING_PROVIDER_NPI_NUM = n.npi
-                WHERE s.HCPCS_CODE IN ('{codes}')
-                GROUP BY s.BILLING_PROVIDER_NPI_NUM, n.state, s.HCPCS_CODE, s.CLAIM_FROM_MONTH
+                WHERE s.HCPCS_CODE IN (SELECT UNNEST($codes::VARCHAR[]))
+                GROUP BY s.BILLING_PROVIDER_NPI_NUM, n.state, s.CLAIM_FROM_MONTH
                 HAVING SUM(s.TOTAL_CLAIMS) > 100
             )
             SELECT 
                 npi,
                 state,
-                ARRAY_AGG(DISTINCT HCPCS_CODE) AS flagged_codes,
-                CLAIM_FROM_MONTH AS flagged_month,
-                monthly_claims,
-                monthly_beneficiaries,
+                flagged_codes,
+                CAST(CLAIM_FROM_MONTH AS VARCHAR) AS flagged_month,
+                monthly_claims::BIGINT,
+                COALESCE(monthly_beneficiaries, 0)::BIGINT,
                 ratio
-            FROM home_health_billing
+            FROM home_health_months
             WHERE ratio < 0.1
-            GROUP BY npi, state, CLAIM_FROM_MONTH, monthly_claims, monthly_beneficiaries, ratio
             ORDER BY ratio ASC
-        """).fetchall()
+        """, {"codes": self.HOME_HEALTH_CODES}))
         
         signals = []
         for row in results:
@@ -548,11 +564,11 @@ class SignalDetector:
                 severity="medium",  # Per spec
                 evidence={
                     "state": state,
-                    "flagged_hcpcs_codes": list(codes) if codes else [],
-                    "flagged_month": str(month) if month else None,
-                    "claims_count": int(claims) if claims else 0,
-                    "unique_beneficiaries": int(beneficiaries) if beneficiaries else 0,
-                    "beneficiary_to_claims_ratio": float(ratio) if ratio else 0
+                    "flagged_hcpcs_codes": codes,
+                    "flagged_month": month,
+                    "claims_count": claims,
+                    "unique_beneficiaries": beneficiaries,
+                    "beneficiary_to_claims_ratio": ratio
                 },
                 estimated_overpayment=0  # Not estimated per spec
             ))
@@ -561,12 +577,40 @@ class SignalDetector:
         return signals
     
     def detect_all_signals(self) -> Dict[str, List[FraudSignal]]:
-        """Run all signal detections and return results."""
-        return {
-            "excluded_provider": self.detect_signal_1_excluded_provider(),
-            "billing_outlier": self.detect_signal_2_billing_outlier(),
-            "rapid_escalation": self.detect_signal_3_rapid_escalation(),
-            "workforce_impossibility": self.detect_signal_4_workforce_impossibility(),
-            "shared_official": self.detect_signal_5_shared_official(),
-            "geographic_implausibility": self.detect_signal_6_geographic_implausibility(),
+        """Run all signal detections concurrently and return results.
+        
+        Each detector gets its own cursor, so one detector's Python
+        post-processing overlaps the others' queries. The queries share
+        DuckDB's thread pool (sized by the `threads` setting), so running
+        them together does not oversubscribe the CPU.
+        """
+        detectors = {
+            "excluded_provider": SignalDetector.detect_signal_1_excluded_provider,
+            "billing_outlier": SignalDetector.detect_signal_2_billing_outlier,
+            "rapid_escalation": SignalDetector.detect_signal_3_rapid_escalation,
+            "workforce_impossibility": SignalDetector.detect_signal_4_workforce_impossibility,
+            "shared_official": SignalDetector.detect_signal_5_shared_official,
+            "geographic_implausibility": SignalDetector.detect_signal_6_geographic_implausibility,
         }
+        with ThreadPoolExecutor(max_workers=len(detectors)) as pool:
+            futures = {
+                signal_type: pool.submit(self._detect_on_cursor, detect)
+                for signal_type, detect in detectors.items()
+            }
+            return {signal_type: future.result() for signal_type, future in futures.items()}
+    
+    def _detect_on_cursor(
+        self, detect: Callable[["SignalDetector"], List[FraudSignal]]
+    ) -> List[FraudSignal]:
+        """Run one detector on a fresh cursor of this connection.
+        
+        A DuckDB connection object is not safe to use from several threads
+        at once, so each detector thread needs its own cursor; cursors share
+        the database and its catalog, including the rollups this detector
+        already ensured.
+        """
+        cursor = self.conn.cursor()
+        try:
+            return detect(SignalDetector(cursor, ensure_tables=False))
+        finally:
+            cursor.close()
@@ -0,0 +1,64 @@
+"""
+Unit tests for DuckDB connection setup in data ingestion.
+"""
+
+from src.ingest import DataIngestor
+
+
+def _setting(ingestor, name):
+    return ingestor.conn.execute("SELECT current_setting(?)", [name]).fetchone()[0]
+
+
+class TestConnectionSettings:
+    """Test the DuckDB settings applied by DataIngestor."""
+    
+    def test_default_settings(self, tmp_path):
+        """Default mode uses two threads and the requested memory limit."""
+        ingestor = DataIngestor(tmp_path, memory_limit='1GB', db_path=':memory:')
+        
+        assert _setting(ingestor, 'threads') == 2
+        assert _setting(ingestor, 'preserve_insertion_order') is False
+        
+    def test_low_memory_runs_single_threaded(self, tmp_path):
+        """Low-memory mode drops DuckDB to a single thread."""
+        ingestor = DataIngestor(tmp_path, memory_limit='1GB', low_memory=True,
+                                db_path=':memory:')
+        
+        assert _setting(ingestor, 'threads') == 1
+        assert _setting(ingestor, 'temp_directory') == str(tmp_path / 'temp')
+
+
+class TestNppesLoading:
+    """Test the NPPES CSV projection into the parquet cache."""
+    
+    def test_columns_read_as_text(self, tmp_path):
+        """Codes keep leading zeros and no row is dropped by type sniffing."""
+        header = [
+            'NPI', 'Entity Type Code', 'Provider Organization Name (Legal Business Name)',
+            'Provider Last Name (Legal Name)', 'Provider First Name',
+            'Provider Business Practice Location Address State Name',
+            'Provider Business Practice Location Address Postal Code',
+            'Healthcare Provider Taxonomy Code_1', 'Provider Enumeration Date',
+            'Authorized Official Last Name', 'Authorized Official First Name',
+            'Replacement NPI',
+        ]
+        rows = [
+            ['1000000001', '2', 'ALPHA CARE', '', '', 'NY', '01234', '251E00000X',
+             '01/01/2020', 'Doe', 'Jane', '1'],
+            ['1000000002', '1', '', 'SMITH', 'ANN', 'MA', '02110', '207Q00000X',
+             '02/01/2020', '', '', 'not-a-number'],
+        ]
+        (tmp_path / 'npidata_pfile_test.csv').write_text(
+            '\n'.join(','.join(f'"{v}"' for v in row) for row in [header] + rows) + '\n'
+        )
+        
+        ingestor = DataIngestor(tmp_path, memory_limit='1GB', db_path=':memory:')
+        ingestor.load_nppes_data()
+        
+        assert ingestor.conn.execute("""
+            SELECT npi, zip_code, provider_name, entity_type, official_key
+            FROM nppes ORDER BY npi
+        """).fetchall() == [
+            ('1000000001', '01234', 'ALPHA CARE', 'organization', 'DOE|JANE'),
+            ('1000000002', '02110', 'SMITH, ANN', 'individual', None),
+        ]
@@ -0,0 +1,180 @@
+"""
+Unit tests for fraud signal report generation.
+
+Signals are built directly; the report ranks, joins and writes them.
+"""
+
+import json
+
+import duckdb
+import pytest
+
+from src.output import ReportGenerator
+from src.signals import FraudSignal
+
+
+@pytest.fixture
+def db_connection():
+    """In-memory DuckDB connection with four providers' spending and NPPES rows."""
+    conn = duckdb.connect()
+    conn.execute("""
+        CREATE TABLE spending AS
+        SELECT * FROM (VALUES
+            ('1000000001', 'G0151', '2024-01', 10, 50, 1000.0),
+            ('1000000002', 'G0151', '2024-01', 20, 80, 2000.0),
+            ('1000000003', 'G0151', '2024-01', 30, 90, 3000.0),
+            ('1000000004', 'G0151', '2024-01', 40, 99, 4000.0)
+        ) AS t(BILLING_PROVIDER_NPI_NUM, HCPCS_CODE, CLAIM_FROM_MONTH,
+               TOTAL_UNIQUE_BENEFICIARIES, TOTAL_CLAIMS, TOTAL_PAID)
+    """)
+    conn.execute("""
+        CREATE TABLE nppes AS
+        SELECT * FROM (VALUES
+            ('1000000001', 'ALPHA CARE', 'organization', '251E00000X', 'NY', '01/01/2020'),
+            ('1000000002', 'BETA HEALTH', 'organization', '251E00000X', 'NY', '01/01/2020'),
+            ('1000000003', 'DOE, JOHN', 'individual', '207Q00000X', 'CA', '01/01/2020')
+        ) AS t(npi, provider_name, entity_type, taxonomy_code, state, enumeration_date)
+    """)
+    yield conn
+    conn.close()
+
+
+def _signal(npi, overpayment, signal_type="billing_outlier", severity="medium"):
+    return FraudSignal(
+        npi=npi,
+        signal_type=signal_type,
+        severity=severity,
+        evidence={"total_paid": overpayment},
+        estimated_overpayment=overpayment,
+    )
+
+
+@pytest.fixture
+def signals_by_type():
+    """Signals summing to 300, 150, 150 and 10 per provider, plus an invalid NPI."""
+    return {
+        "excluded_provider": [
+            _signal('1000000001', 100.0, "excluded_provider", "critical"),
+            _signal('123', 999.0, "excluded_provider", "critical"),
+        ],
+        "billing_outlier": [
+            _signal('1000000002', 300.0),
+            _signal('1000000003', 150.0),
+            _signal('1000000001', 50.0),
+            _signal('1000000004', 10.0),
+        ],
+    }
+
+
+class TestReportRanking:
+    """Test provider ranking and the top_k cut."""
+
+    def test_ranks_by_total_overpayment(self, db_connection, signals_by_type, tmp_path):
+        """Providers rank by summed overpayment; ties keep detection order."""
+        generator = ReportGenerator(db_connection)
+        report = generator.generate_report(signals_by_type, str(tmp_path / "report.json"),
+                                           write=False)
+
+        providers = report["flagged_providers"]
+        assert isinstance(providers, list)
+        assert [p["npi"] for p in providers] == [
+            '1000000002', '1000000001', '1000000003', '1000000004'
+        ]
+        assert [p["estimated_overpayment_usd"] for p in providers] == [300.0, 150.0, 150.0, 10.0]
+
+        # Signals stay in detection order; the first sets the FCA reference
+        alpha = providers[1]
+        assert [s["signal_type"] for s in alpha["signals"]] == [
+            "excluded_provider", "billing_outlier"
+        ]
+        assert alpha["provider_name"] == "ALPHA CARE"
+        assert alpha["total_paid_all_time"] == 1000.0
+        assert alpha["total_claims_all_time"] == 50
+        assert alpha["fca_relevance"]["statute_reference"] == "31 U.S.C. § 3729(a)(1)(A)"
+
+        # No NPPES row: placeholder details, totals still joined
+        unknown = providers[3]
+        assert unknown["provider_name"] == "Unknown"
+        assert unknown["total_paid_all_time"] == 4000.0
+
+        assert report["total_providers_flagged"] == 4
+        assert report["total_providers_scanned"] == 4
+        assert report["signal_counts"]["excluded_provider"] == 2
+        assert report["signal_counts"]["billing_outlier"] == 4
+
+    def test_top_k_keeps_full_flagged_count(self, db_connection, signals_by_type, tmp_path):
+        """top_k lists only the highest-overpayment providers but counts them all."""
+        generator = ReportGenerator(db_connection)
+        report = generator.generate_report(signals_by_type, str(tmp_path / "report.json"),
+                                           write=False, top_k=2)
+
+        assert [p["npi"] for p in report["flagged_providers"]] == ['1000000002', '1000000001']
+        assert report["total_providers_flagged"] == 4
+
+
+class TestReportWriting:
+    """Test the JSON report and its Parquet signal table."""
+
+    def test_json_round_trips(self, db_connection, signals_by_type, tmp_path):
+        """The streamed JSON parses back to the generated report."""
+        output_path = tmp_path / "report.json"
+        generator = ReportGenerator(db_connection)
+        report = generator.generate_report(signals_by_type, str(output_path))
+
+        with open(output_path) as f:
+            written = json.load(f)
+
+        assert list(written) == list(report)
+        assert written["flagged_providers"] == report["flagged_providers"]
+        assert written["total_providers_flagged"] == 4
+        assert not (tmp_path / "report.json.tmp").exists()
+        # The signal table is only written on request
+        assert [p.name for p in tmp_path.iterdir()] == ["report.json"]
+
+    def test_signal_table_must_differ_from_report(self, db_connection, signals_by_type,
+                                                  tmp_path):
+        """Writing the signal table over the report itself is rejected."""
+        output_path = tmp_path / "report.parquet"
+        generator = ReportGenerator(db_connection)
+        report = generator.generate_report(signals_by_type, str(output_path), write=False)
+
+        with pytest.raises(ValueError):
+            generator.write_report(report, str(output_path), signal_table_path=str(output_path))
+        assert not output_path.exists()
+
+    def test_signal_table_and_deferred_fields(self, db_connection, signals_by_type, tmp_path):
+        """Each signal gets a Parquet row; deferred fields run after both outputs exist."""
+        output_path = tmp_path / "report.json"
+        parquet_path = tmp_path / "report.parquet"
+        generator = ReportGenerator(db_connection)
+        report = generator.generate_report(signals_by_type, str(output_path),
+                                           write=False, top_k=3)
+        deferred = generator.write_report(
+            report, str(output_path),
+            signal_table_path=str(parquet_path),
+            deferred={"execution_metrics": lambda: {"signal_table_written": parquet_path.exists()}},
+        )
+
+        assert deferred == {"execution_metrics": {"signal_table_written": True}}
+        assert "execution_metrics" not in report
+        with open(output_path) as f:
+            written = json.load(f)
+        assert list(written)[-1] == "execution_metrics"
+        assert written["execution_metrics"] == {"signal_table_written": True}
+
+        rows = db_connection.execute("""
+            SELECT provider_rank, npi, signal_index, signal_type
+            FROM read_parquet(?)
+            ORDER BY provider_rank, signal_index
+        """, [str(parquet_path)]).fetchall()
+        assert rows == [
+            (0, '1000000002', 0, 'billing_outlier'),
+            (1, '1000000001', 0, 'excluded_provider'),
+            (1, '1000000001', 1, 'billing_outlier'),
+            (2, '1000000003', 0, 'billing_outlier'),
+        ]
+
+        header = db_connection.execute(
+            "SELECT value FROM parquet_kv_metadata(?) WHERE key = 'report'", [str(parquet_path)]
+        ).fetchone()[0]
+        assert json.loads(header)["total_providers_flagged"] == 4